@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-17 13:23
+
+from django.db import migrations
+
+
+def remove_duplicate_course_employees(apps, schema_editor):
+    """Keep only the newest CourseEmployee row per (course, person)."""
+    CourseEmployee = apps.get_model("core", "CourseEmployee")
+    seen = set()
+    duplicate_ids = []
+    for pk, course_id, person_id in CourseEmployee.objects.order_by(
+        "-created_at", "-pk"
+    ).values_list("pk", "course_id", "person_id"):
+        if (course_id, person_id) in seen:
+            duplicate_ids.append(pk)
+        else:
+            seen.add((course_id, person_id))
+    CourseEmployee.objects.filter(pk__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_alter_qlikitem_classification_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_course_employees, migrations.RunPython.noop
+        ),
+        migrations.AlterUniqueTogether(
+            name="courseemployee",
+            unique_together={("course", "person")},
+        ),
+    ]
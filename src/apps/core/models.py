@@ -212,6 +212,9 @@ class CourseEmployee(TimestampedModel):
     person = models.ForeignKey(Person, on_delete=models.CASCADE)
     role = models.CharField(max_length=255, null=True, blank=True)
 
+    class Meta:
+        unique_together = ("course", "person")
+
     def __str__(self):
         return f"{self.person} - {self.course} ({self.role})"
 
@@ -279,10 +279,17 @@ async def refresh_file_existence_async(
         logger.info("No items need file existence verification")
         return {"checked": 0, "exists": 0, "not_exists": 0}
 
-    # Set up HTTP client
+    # Set up HTTP client: one HTTP/2 connection multiplexes the concurrent
+    # checks instead of opening a TLS connection per in-flight request.
     headers = {"Authorization": f"Bearer {api_token}"}
     async with httpx.AsyncClient(
-        headers=headers, follow_redirects=True, timeout=20.0
+        headers=headers,
+        follow_redirects=True,
+        timeout=20.0,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=max_concurrent, max_keepalive_connections=max_concurrent
+        ),
     ) as client:
         logger.info(f"Checking file existence for {len(items_to_check)} items")
 
@@ -17,7 +17,9 @@ def link_courses() -> None:
     logger.info("Linking courses to copyright items...")
 
     # Process all items to ensure current links are up to date
-    items = list(CopyrightItem.objects.all())
+    items = list(
+        CopyrightItem.objects.only("material_id", "course_code", "course_name")
+    )
 
     if not items:
         logger.info("No items to process for course linking")
@@ -62,35 +64,29 @@ def link_courses() -> None:
         f"Fetched {len(courses)} courses for {len(valid_course_codes)} course codes"
     )
 
-    links_added = 0
+    # Collect the desired links, then write the missing ones in bulk
+    desired_links: set[tuple[int, int]] = set()
+    for item_id, code_strs in item_course_map.items():
+        for code_str in code_strs:
+            int_code = safe_int(code_str)
+            if int_code and int_code in course_map:
+                desired_links.add((item_id, int_code))
 
-    # Batch processing with transaction
+    ItemCourse = CopyrightItem.courses.through
     with transaction.atomic():
-        for item in items:
-            item_id = item.material_id
-            if item_id not in item_course_map:
-                continue
-
-            # Identify desired course objects
-            desired_courses = []
-            for code_str in item_course_map[item_id]:
-                int_code = safe_int(code_str)
-                if int_code and int_code in course_map:
-                    desired_courses.append(course_map[int_code])
-
-            if not desired_courses:
-                continue
-
-            # Check existing links (prefetching usually better, but for now simple loop)
-            # Optimization: could bulk prefetch item.courses for all items
-            # But let's stick to correctness first.
-            existing_ids = set(item.courses.values_list("cursuscode", flat=True))
-
-            to_add = [c for c in desired_courses if c.cursuscode not in existing_ids]
-
-            if to_add:
-                item.courses.add(*to_add)
-                links_added += len(to_add)
+        existing_links = set(
+            ItemCourse.objects.filter(
+                copyrightitem_id__in={item_id for item_id, _ in desired_links}
+            ).values_list("copyrightitem_id", "course_id")
+        )
+        new_links = [
+            ItemCourse(copyrightitem_id=item_id, course_id=course_id)
+            for item_id, course_id in desired_links - existing_links
+        ]
+        ItemCourse.objects.bulk_create(
+            new_links, batch_size=1000, ignore_conflicts=True
+        )
+    links_added = len(new_links)
 
     if links_added:
         logger.info(f"Added {links_added} course links")
@@ -4,8 +4,6 @@ Tests for cache service.
 Tests the cache decorators and invalidation utilities.
 """
 
-import pytest
-
 from apps.core.services.cache_service import (
     cache_async_result,
     cache_query_result,
@@ -107,7 +105,6 @@ class TestCacheService:
 class TestAsyncCacheService:
     """Test asynchronous cache decorator."""
 
-    @pytest.mark.asyncio
     async def test_async_cache_decorator_hit(self):
         """Test async cache returns cached value on second call."""
         call_count = 0
@@ -128,7 +125,6 @@ class TestAsyncCacheService:
         assert result2 == 10
         assert call_count == 1  # Should not increment
 
-    @pytest.mark.asyncio
     async def test_async_cache_decorator_miss_different_args(self):
         """Test async cache misses for different arguments."""
         call_count = 0
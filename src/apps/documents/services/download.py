@@ -4,6 +4,7 @@ Ports logic from ea-cli/easy_access/pdf/download.py
 """
 
 import asyncio
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 
 import httpx
@@ -15,6 +16,11 @@ from apps.core.services.retry_logic import async_retry
 from apps.core.services.transactions import atomic_async
 from apps.documents.models import Document, PDFCanvasMetadata
 
+# PDFs downloaded concurrently by download_undownloaded_pdfs
+DOWNLOAD_CONCURRENCY = 5
+# Bytes read from the response per file write
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 @async_retry(max_retries=3, base_delay=1.0, max_delay=60.0)
 async def download_pdf_from_canvas(
@@ -115,7 +121,7 @@ async def download_pdf_from_canvas(
                 await asyncio.sleep(10)
 
             with filepath.open("wb") as f:
-                async for chunk in file_response.aiter_bytes():
+                async for chunk in file_response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
 
         return filepath, pdf_metadata_obj
@@ -186,12 +192,22 @@ async def create_or_link_document(
     return doc
 
 
-async def download_undownloaded_pdfs(limit: int = 0) -> dict:
+async def download_undownloaded_pdfs(
+    limit: int = 0,
+    filter_ids: list[int] | None = None,
+    on_downloaded: Callable[[CopyrightItem], Awaitable[None]] | None = None,
+    max_concurrent: int = DOWNLOAD_CONCURRENCY,
+) -> dict:
     """
     Downloads all PDFs that have file_exists=True but no PDF record yet.
 
     Args:
         limit: Maximum number of PDFs to download (0 = no limit)
+        filter_ids: Optional list of copyright_item IDs to restrict downloads to
+        on_downloaded: Optional coroutine called with each item once its
+            document is linked, e.g. to hand it to a parser while the
+            remaining downloads continue
+        max_concurrent: Maximum number of PDFs downloaded at the same time
 
     Returns:
         Dictionary with statistics
@@ -205,15 +221,14 @@ async def download_undownloaded_pdfs(limit: int = 0) -> dict:
 
     # Find items that need downloading using native async ORM
     # Items where file_exists=True but no PDF record
-    items = [
-        item
-        async for item in CopyrightItem.objects.filter(
-            file_exists=True,
-            document__isnull=True,
-        )
+    queryset = (
+        CopyrightItem.objects.filter(file_exists=True, document__isnull=True)
         .exclude(url__isnull=True)
-        .exclude(url="")[: limit if limit > 0 else 400000]
-    ]
+        .exclude(url="")
+    )
+    if filter_ids is not None:
+        queryset = queryset.filter(material_id__in=filter_ids)
+    items = [item async for item in queryset[: limit if limit > 0 else 400000]]
 
     if not items:
         logger.info("No undownloaded PDFs to download")
@@ -223,13 +238,17 @@ async def download_undownloaded_pdfs(limit: int = 0) -> dict:
 
     # Set up client
     headers = {"Authorization": f"Bearer {api_token}"}
-    semaphore = asyncio.Semaphore(5)  # Limit concurrent downloads
+    semaphore = asyncio.Semaphore(max_concurrent)  # Limit concurrent downloads
 
     downloaded = 0
     failed = 0
 
     async with httpx.AsyncClient(
-        headers=headers, follow_redirects=True, timeout=60.0
+        headers=headers,
+        follow_redirects=True,
+        timeout=60.0,
+        http2=True,
+        limits=httpx.Limits(max_connections=max_concurrent),
     ) as client:
 
         async def download_single(item: CopyrightItem) -> bool:
@@ -250,23 +269,33 @@ async def download_undownloaded_pdfs(limit: int = 0) -> dict:
 
                     result = await download_pdf_from_canvas(item.url, filepath, client)
 
-                    if result:
-                        file_path, pdf_metadata_obj = result
-
-                        # Create or link document with atomic transaction
-                        # Each item is processed in its own transaction
-                        await create_or_link_document(item, file_path, pdf_metadata_obj)
-                        downloaded += 1
-                        return True
-                    else:
+                    if not result:
                         failed += 1
                         return False
 
+                    file_path, pdf_metadata_obj = result
+
+                    # Create or link document with atomic transaction
+                    # Each item is processed in its own transaction
+                    await create_or_link_document(item, file_path, pdf_metadata_obj)
+                    downloaded += 1
+
             except Exception:
                 logger.exception(f"Error downloading material_id {item.material_id}")
                 failed += 1
                 return False
 
+            # Outside the semaphore, so a slow callback does not hold a
+            # download slot; its errors do not make the download a failure
+            if on_downloaded:
+                try:
+                    await on_downloaded(item)
+                except Exception:
+                    logger.exception(
+                        f"Error handling downloaded material_id {item.material_id}"
+                    )
+            return True
+
         tasks = [download_single(item) for item in items]
         await asyncio.gather(*tasks, return_exceptions=True)
 
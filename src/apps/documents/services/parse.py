@@ -11,6 +11,8 @@ Includes:
 - Entity extraction (spaCy-based)
 """
 
+import asyncio
+import os
 from pathlib import Path
 
 from loguru import logger
@@ -18,6 +20,9 @@ from xxhash import xxh3_64_hexdigest
 
 from apps.documents.models import Document, PDFText
 
+# Documents parsed concurrently by parse_pdfs
+PARSE_CONCURRENCY = os.cpu_count() or 1
+
 
 def hash_pdf(file_path: Path) -> str | None:
     """
@@ -159,6 +164,111 @@ async def extract_text_from_pdf(file_path: Path) -> dict | None:
         return None
 
 
+async def _parse_document(doc: Document, skip_text: bool) -> tuple[bool, bool]:
+    """
+    Hash and extract a single Document, then save it.
+
+    Returns:
+        Tuple of (processed, successful)
+    """
+    from asgiref.sync import sync_to_async
+
+    try:
+        # Construct file path
+        if not doc.file:
+            logger.warning(f"Document {doc.id} has no file")
+            return False, False
+
+        file_path = Path(doc.file.path)
+
+        if not file_path.exists():
+            logger.warning(f"PDF file not found: {file_path}")
+            return False, False
+
+        # Hash the file
+        # Hash should already be there from download, but recalculate if missing
+        if not doc.filehash:
+            file_hash = hash_pdf(file_path)
+            if file_hash:
+                doc.filehash = file_hash
+
+        # Extract text if not skipping
+        if not skip_text:
+            doc.extraction_attempted = True
+            extraction_result = await extract_text_from_pdf(file_path)
+
+            if extraction_result and len(extraction_result.get("content", "")) > 0:
+                doc.extraction_successful = True
+
+                # Combine chunks and entities for storage
+                # Chunks now also include any extracted entities for that PDF
+                chunks_with_data = extraction_result.get("chunks", [])
+                entities = extraction_result.get("entities", [])
+                # todo: store entities as models + m2m relation
+
+                # Create PDFText record with all extracted data
+                @sync_to_async
+                def create_pdf_text(
+                    result=extraction_result,
+                    chunks=chunks_with_data,
+                    ents=entities,
+                ):
+                    return PDFText.objects.create(
+                        extracted_text=result["content"],
+                        num_pages=result.get("num_pages"),
+                        text_quality=result.get("quality_score", 0.0),
+                        detected_language=result.get("detected_language"),
+                        extracted_keywords=result.get("keywords"),
+                        chunks_with_embeddings={
+                            "chunks": chunks,
+                            "entities": ents,
+                        },
+                    )
+
+                pdf_text = await create_pdf_text()
+                doc.extracted_text = pdf_text
+
+                # Update document metadata
+                if extraction_result.get("title"):
+                    doc.title = extraction_result["title"]
+                if extraction_result.get("author"):
+                    doc.author = extraction_result["author"]
+                if extraction_result.get("creator"):
+                    doc.creator = extraction_result["creator"]
+                if extraction_result.get("subject"):
+                    doc.subject = extraction_result["subject"]
+                if extraction_result.get("summary"):
+                    doc.summary = extraction_result["summary"]
+                if extraction_result.get("description"):
+                    doc.description = extraction_result["description"]
+                if extraction_result.get("num_pages"):
+                    doc.num_pages = extraction_result["num_pages"]
+                if extraction_result.get("keywords"):
+                    doc.keywords = extraction_result["keywords"]
+
+                successful = True
+            else:
+                doc.extraction_successful = False
+                successful = False
+        else:
+            successful = True
+
+        # Save Document record
+        @sync_to_async
+        def save_doc(document=doc):
+            document.save()
+
+        await save_doc()
+        return True, successful
+
+    except Exception as e:
+        logger.error(f"Error processing Document {doc.id}: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False, False
+
+
 async def parse_pdfs(
     filter_ids: list[int] | None = None, skip_text: bool = False
 ) -> dict:
@@ -179,7 +289,7 @@ async def parse_pdfs(
     def get_documents_to_process():
         queryset = Document.objects.filter(extraction_attempted=False)
         if filter_ids:
-            queryset = queryset.filter(items__material_id__in=filter_ids)
+            queryset = queryset.filter(items__material_id__in=filter_ids).distinct()
         return list(queryset)
 
     documents = await get_documents_to_process()
@@ -190,107 +300,18 @@ async def parse_pdfs(
 
     logger.info(f"Processing {len(documents)} documents")
 
-    processed = 0
-    successful = 0
-    failed = 0
-
-    for doc in documents:
-        try:
-            # Construct file path
-            if not doc.file:
-                logger.warning(f"Document {doc.id} has no file")
-                failed += 1
-                continue
-
-            file_path = Path(doc.file.path)
-
-            if not file_path.exists():
-                logger.warning(f"PDF file not found: {file_path}")
-                failed += 1
-                continue
-
-            # Hash the file
-            # Hash should already be there from download, but recalculate if missing
-            if not doc.filehash:
-                file_hash = hash_pdf(file_path)
-                if file_hash:
-                    doc.filehash = file_hash
-
-            # Extract text if not skipping
-            if not skip_text:
-                doc.extraction_attempted = True
-                extraction_result = await extract_text_from_pdf(file_path)
-
-                if extraction_result and len(extraction_result.get("content", "")) > 0:
-                    doc.extraction_successful = True
-
-                    # Combine chunks and entities for storage
-                    # Chunks now also include any extracted entities for that PDF
-                    chunks_with_data = extraction_result.get("chunks", [])
-                    entities = extraction_result.get("entities", [])
-                    # todo: store entities as models + m2m relation
-
-                    # Create PDFText record with all extracted data
-                    @sync_to_async
-                    def create_pdf_text(
-                        result=extraction_result,
-                        chunks=chunks_with_data,
-                        ents=entities,
-                    ):
-                        return PDFText.objects.create(
-                            extracted_text=result["content"],
-                            num_pages=result.get("num_pages"),
-                            text_quality=result.get("quality_score", 0.0),
-                            detected_language=result.get("detected_language"),
-                            extracted_keywords=result.get("keywords"),
-                            chunks_with_embeddings={
-                                "chunks": chunks,
-                                "entities": ents,
-                            },
-                        )
-
-                    pdf_text = await create_pdf_text()
-                    doc.extracted_text = pdf_text
-
-                    # Update document metadata
-                    if extraction_result.get("title"):
-                        doc.title = extraction_result["title"]
-                    if extraction_result.get("author"):
-                        doc.author = extraction_result["author"]
-                    if extraction_result.get("creator"):
-                        doc.creator = extraction_result["creator"]
-                    if extraction_result.get("subject"):
-                        doc.subject = extraction_result["subject"]
-                    if extraction_result.get("summary"):
-                        doc.summary = extraction_result["summary"]
-                    if extraction_result.get("description"):
-                        doc.description = extraction_result["description"]
-                    if extraction_result.get("num_pages"):
-                        doc.num_pages = extraction_result["num_pages"]
-                    if extraction_result.get("keywords"):
-                        doc.keywords = extraction_result["keywords"]
-
-                    successful += 1
-                else:
-                    doc.extraction_successful = False
-                    failed += 1
-            else:
-                successful += 1
-
-            # Save Document record
-            @sync_to_async
-            def save_doc(document=doc):
-                document.save()
-
-            await save_doc()
-            processed += 1
+    # Extraction is CPU-heavy and kreuzberg runs it off the event loop, so
+    # documents are parsed concurrently, one per core.
+    semaphore = asyncio.Semaphore(PARSE_CONCURRENCY)
 
-        except Exception as e:
-            logger.error(f"Error processing Document {doc.id}: {e}")
-            import traceback
+    async def parse_single(doc: Document) -> tuple[bool, bool]:
+        async with semaphore:
+            return await _parse_document(doc, skip_text)
 
-            traceback.print_exc()
-            failed += 1
+    outcomes = await asyncio.gather(*(parse_single(doc) for doc in documents))
+    processed = sum(done for done, _ in outcomes)
+    successful = sum(ok for _, ok in outcomes)
+    failed = len(outcomes) - successful
 
     logger.info(
         f"Parsing complete: {processed} processed, {successful} successful, {failed} failed"
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for document service tests.
+
+The tests in this package run with transaction=True (the services use the ORM
+from worker threads), so the database is flushed after every test. Fixtures are
+therefore function-scoped; they exist to keep the setup in one place. Only the
+PDF payload, which never touches the database, is shared per module.
+"""
+
+import pytest
+import xxhash
+
+from apps.core.models import Faculty
+from apps.documents.models import PDFCanvasMetadata
+
+
+@pytest.fixture
+async def bms_faculty() -> Faculty:
+    """Return the BMS faculty used as owner of test items."""
+    faculty, _ = await Faculty.objects.aget_or_create(
+        abbreviation="BMS",
+        defaults={"name": "BMS", "hierarchy_level": 1, "full_abbreviation": "UT-BMS"},
+    )
+    return faculty
+
+
+@pytest.fixture
+def metadata_factory():
+    """Return a coroutine that creates Canvas metadata for a numbered test file."""
+
+    async def _create(number: int) -> PDFCanvasMetadata:
+        return await PDFCanvasMetadata.objects.acreate(
+            uuid=f"uuid{number}",
+            display_name=f"test{number}.pdf",
+            filename=f"test{number}.pdf",
+            size=10,
+            canvas_created_at="2024-01-01T00:00:00Z",
+            canvas_updated_at="2024-01-01T00:00:00Z",
+            locked=False,
+            hidden=False,
+            visibility_level="public",
+            download_url=f"http://example.com/{number}",
+        )
+
+    return _create
+
+
+@pytest.fixture(scope="module")
+def pdf_blob() -> tuple[bytes, str]:
+    """Return canonical PDF bytes and their xxh3 file hash, computed once."""
+    content = b"%PDF-1.4\n%test document\n%%EOF\n"
+    return content, xxhash.xxh3_64_hexdigest(content)
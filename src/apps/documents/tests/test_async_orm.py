@@ -13,8 +13,7 @@ from apps.core.models import CopyrightItem, Faculty
 from apps.documents.models import Document, PDFCanvasMetadata
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_aget_or_create_creates_new_document():
     """Test that aget_or_create creates a new document when hash doesn't exist."""
     metadata = await PDFCanvasMetadata.objects.acreate(
@@ -64,8 +63,7 @@ async def test_async_aget_or_create_creates_new_document():
         test_path.unlink(missing_ok=True)
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_aget_or_create_fetches_existing_document():
     """Test that aget_or_create fetches existing document when hash exists."""
     metadata = await PDFCanvasMetadata.objects.acreate(
@@ -105,8 +103,7 @@ async def test_async_aget_or_create_fetches_existing_document():
     assert doc.filename == "existing.pdf"  # Original value preserved
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_aupdate_or_create_updates_existing_document():
     """Test that aupdate_or_create updates existing document."""
     metadata = await PDFCanvasMetadata.objects.acreate(
@@ -152,8 +149,7 @@ async def test_async_aupdate_or_create_updates_existing_document():
     assert updated_meta.filename == "updated.pdf"
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_asave_updates_item_fields():
     """Test that asave correctly updates item fields."""
     faculty, _ = await Faculty.objects.aget_or_create(
@@ -180,8 +176,7 @@ async def test_async_asave_updates_item_fields():
     assert item.filehash == "new_hash_789"
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_acount_counts_documents():
     """Test that acount correctly counts documents."""
     # Create 3 different metadata objects (OneToOneField requires unique metadata per document)
@@ -242,8 +237,7 @@ async def test_async_acount_counts_documents():
     assert filtered_count == 1
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_afilter_with_related():
     """Test that afilter correctly handles related fields."""
     faculty, _ = await Faculty.objects.aget_or_create(
@@ -298,8 +292,7 @@ async def test_async_afilter_with_related():
     assert without_doc_count >= 1
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_aiter_iterates_over_queryset():
     """Test that async for iteration works correctly."""
     faculty, _ = await Faculty.objects.aget_or_create(
@@ -308,13 +301,17 @@ async def test_async_aiter_iterates_over_queryset():
     )
 
     # Create multiple items
-    for i in range(5):
-        await CopyrightItem.objects.acreate(
-            material_id=200 + i,
-            url=f"http://canvas/files/{200 + i}",
-            file_exists=True,
-            faculty=faculty,
-        )
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=200 + i,
+                url=f"http://canvas/files/{200 + i}",
+                file_exists=True,
+                faculty=faculty,
+            )
+            for i in range(5)
+        ]
+    )
 
     # Iterate using async for
     collected_ids = []
@@ -327,8 +324,7 @@ async def test_async_aiter_iterates_over_queryset():
     assert set(collected_ids) == {200, 201, 202, 203, 204}
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_adelete_removes_records():
     """Test that adelete correctly removes records."""
     _faculty, _ = await Faculty.objects.aget_or_create(
@@ -365,8 +361,7 @@ async def test_async_adelete_removes_records():
     assert await Document.objects.filter(filehash="to_delete").acount() == 0
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_afirst_gets_first_result():
     """Test that afirst returns the first record or None."""
     faculty, _ = await Faculty.objects.aget_or_create(
@@ -375,11 +370,15 @@ async def test_async_afirst_gets_first_result():
     )
 
     # Create items
-    await CopyrightItem.objects.acreate(
-        material_id=300, url="http://a", file_exists=True, faculty=faculty
-    )
-    await CopyrightItem.objects.acreate(
-        material_id=301, url="http://b", file_exists=True, faculty=faculty
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=300, url="http://a", file_exists=True, faculty=faculty
+            ),
+            CopyrightItem(
+                material_id=301, url="http://b", file_exists=True, faculty=faculty
+            ),
+        ]
     )
 
     # Get first by material_id (ordered by pk by default)
@@ -392,8 +391,7 @@ async def test_async_afirst_gets_first_result():
     assert none_result is None
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_aupdate_updates_queryset():
     """Test that aupdate updates all matching records."""
     faculty, _ = await Faculty.objects.aget_or_create(
@@ -402,11 +400,15 @@ async def test_async_aupdate_updates_queryset():
     )
 
     # Create items with specific status
-    await CopyrightItem.objects.acreate(
-        material_id=400, url="http://a", file_exists=True, faculty=faculty
-    )
-    await CopyrightItem.objects.acreate(
-        material_id=401, url="http://b", file_exists=True, faculty=faculty
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=400, url="http://a", file_exists=True, faculty=faculty
+            ),
+            CopyrightItem(
+                material_id=401, url="http://b", file_exists=True, faculty=faculty
+            ),
+        ]
     )
 
     # Update all with material_id >= 400
@@ -423,8 +425,7 @@ async def test_async_aupdate_updates_queryset():
     assert item401.file_exists is False
 
 
-@pytest.mark.django_db
-@pytest.mark.asyncio
+@pytest.mark.django_db(transaction=True)
 async def test_async_select_related_works():
     """Test that select_related reduces queries in async context."""
 
@@ -8,7 +8,6 @@ from apps.documents.models import Document, PDFCanvasMetadata, PDFText
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
 async def test_document_deduplication(tmp_path):
     """
     Test that documents with same filehash are deduplicated at DB level (unique constraint).
@@ -75,7 +74,6 @@ async def test_document_deduplication(tmp_path):
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
 async def test_extraction_service_call():
     # This test verifies that parse_pdfs calls the extraction service
     from asgiref.sync import sync_to_async
@@ -118,3 +116,30 @@ async def test_extraction_service_call():
         # Check pdftext
         pdftext = await PDFText.objects.aget(document=doc)
         assert pdftext.extracted_text == "extracted text"
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_parse_pdfs_counts_concurrent_outcomes(metadata_factory):
+    from asgiref.sync import sync_to_async
+
+    from apps.documents.services.parse import parse_pdfs
+
+    for number in (21, 22, 23):
+        meta = await metadata_factory(number)
+        doc = await Document.objects.acreate(
+            canvas_metadata=meta, filehash=f"hash{number}", filename=meta.filename
+        )
+        await sync_to_async(doc.file.save)(meta.filename, ContentFile(b"something"))
+
+    async def fake_extract(file_path):
+        if "test22" in file_path.name:
+            return None
+        return {"content": "extracted text"}
+
+    with patch(
+        "apps.documents.services.parse.extract_text_from_pdf", side_effect=fake_extract
+    ):
+        result = await parse_pdfs()
+
+    assert result == {"processed": 3, "successful": 2, "failed": 1}
+    assert await PDFText.objects.acount() == 2
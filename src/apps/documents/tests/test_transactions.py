@@ -6,12 +6,13 @@ and tested through the E2E pipeline. Direct unit testing of FileField
 operations in async context has Django limitations.
 """
 
-from unittest.mock import patch
+import asyncio
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from apps.core.models import CopyrightItem, Faculty
-from apps.documents.models import Document, PDFCanvasMetadata
+from apps.core.models import CopyrightItem
+from apps.documents.models import Document
 from apps.documents.services.download import (
     create_or_link_document,
     download_undownloaded_pdfs,
@@ -19,34 +20,24 @@ from apps.documents.services.download import (
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
-async def test_download_failure_does_not_create_orphaned_records(tmp_path):
+async def test_download_failure_does_not_create_orphaned_records(
+    tmp_path, bms_faculty
+):
     """
     Test that PDF download failures don't create orphaned records.
     """
-    # Setup
-    faculty, _ = await Faculty.objects.aget_or_create(
-        abbreviation="BMS",
-        defaults={"name": "BMS", "hierarchy_level": 1, "full_abbreviation": "UT-BMS"},
-    )
-
-    # Create items that will fail to download
-    await CopyrightItem.objects.aget_or_create(
-        material_id=7,
-        defaults={
-            "url": "http://canvas/files/7",  # Will return 404
-            "file_exists": True,
-            "faculty": faculty,
-        },
-    )
-
-    await CopyrightItem.objects.aget_or_create(
-        material_id=8,
-        defaults={
-            "url": "http://canvas/files/8",  # Will return 404
-            "file_exists": True,
-            "faculty": faculty,
-        },
+    # Create items that will fail to download (URLs return 404)
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=material_id,
+                url=f"http://canvas/files/{material_id}",
+                file_exists=True,
+                faculty=bms_faculty,
+            )
+            for material_id in (7, 8)
+        ],
+        ignore_conflicts=True,
     )
 
     # Mock download to fail (returns None for failure)
@@ -69,40 +60,116 @@ async def test_download_failure_does_not_create_orphaned_records(tmp_path):
     assert result["downloaded"] == 0
     assert result["failed"] >= 2
 
+
+@pytest.mark.django_db(transaction=True)
+async def test_download_filter_ids_limits_items(tmp_path, bms_faculty):
+    """
+    Test that filter_ids restricts the downloader to the given items.
+    """
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=material_id,
+                url=f"http://canvas/files/{material_id}",
+                file_exists=True,
+                faculty=bms_faculty,
+            )
+            for material_id in (9, 10, 11)
+        ]
+    )
+
+    requested = []
+
+    async def mock_download(url, filepath, client):
+        requested.append(url)
+        return None
+
+    with (
+        patch(
+            "apps.documents.services.download.download_pdf_from_canvas",
+            side_effect=mock_download,
+        ),
+        patch(
+            "apps.documents.services.download.settings.CANVAS_API_TOKEN", "fake-token"
+        ),
+        patch("apps.documents.services.download.settings.PDF_DOWNLOAD_DIR", tmp_path),
+    ):
+        await download_undownloaded_pdfs(filter_ids=[9, 11])
+
+    assert sorted(requested) == ["http://canvas/files/11", "http://canvas/files/9"]
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_download_callback_runs_outside_download_slot(tmp_path, bms_faculty):
+    """
+    Test that on_downloaded neither holds a download slot nor counts as a failure.
+    """
+    await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(
+                material_id=material_id,
+                url=f"http://canvas/files/{material_id}",
+                file_exists=True,
+                faculty=bms_faculty,
+            )
+            for material_id in (12, 13)
+        ]
+    )
+    second_download = asyncio.Event()
+
+    async def mock_download(url, filepath, client):
+        if url.endswith("/13"):
+            second_download.set()
+        return filepath, None
+
+    async def on_downloaded(item):
+        if item.material_id == 12:
+            # Only returns if the other item could still be downloaded
+            await asyncio.wait_for(second_download.wait(), timeout=2)
+            raise RuntimeError("parser queue closed")
+
+    with (
+        patch(
+            "apps.documents.services.download.download_pdf_from_canvas",
+            side_effect=mock_download,
+        ),
+        patch(
+            "apps.documents.services.download.create_or_link_document",
+            AsyncMock(),
+        ),
+        patch(
+            "apps.documents.services.download.settings.CANVAS_API_TOKEN", "fake-token"
+        ),
+        patch("apps.documents.services.download.settings.PDF_DOWNLOAD_DIR", tmp_path),
+    ):
+        result = await download_undownloaded_pdfs(
+            filter_ids=[12, 13], on_downloaded=on_downloaded, max_concurrent=1
+        )
+
+    assert second_download.is_set()
+    assert result == {"downloaded": 2, "failed": 0}
+
+
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
-async def test_create_document_rollback_on_item_save_failure(tmp_path):
+async def test_create_document_rollback_on_item_save_failure(
+    tmp_path, bms_faculty, metadata_factory, pdf_blob
+):
     """
     Test that document creation is rolled back if item update fails.
     """
     # Setup
-    faculty, _ = await Faculty.objects.aget_or_create(
-        abbreviation="BMS",
-        defaults={"name": "BMS", "hierarchy_level": 1, "full_abbreviation": "UT-BMS"},
-    )
     item = await CopyrightItem.objects.acreate(
         material_id=100,
         url="http://canvas/files/100",
         file_exists=True,
-        faculty=faculty,
+        faculty=bms_faculty,
     )
 
-    meta = await PDFCanvasMetadata.objects.acreate(
-        uuid="uuid100",
-        display_name="test100.pdf",
-        filename="test100.pdf",
-        size=10,
-        canvas_created_at="2024-01-01T00:00:00Z",
-        canvas_updated_at="2024-01-01T00:00:00Z",
-        locked=False,
-        hidden=False,
-        visibility_level="public",
-        download_url="http://example.com/100"
-    )
+    meta = await metadata_factory(100)
 
     # Create a dummy file
     file_path = tmp_path / "test100.pdf"
-    file_path.write_bytes(b"content")
+    file_path.write_bytes(pdf_blob[0])
 
     # Mock item.asave to fail
     with patch.object(CopyrightItem, 'asave', side_effect=Exception("DB Error")):
@@ -118,39 +185,25 @@ async def test_create_document_rollback_on_item_save_failure(tmp_path):
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
-async def test_successful_create_document_commits(tmp_path):
+async def test_successful_create_document_commits(
+    tmp_path, bms_faculty, metadata_factory, pdf_blob
+):
     """
     Test that document is created and linked successfully.
     """
     # Setup
-    faculty, _ = await Faculty.objects.aget_or_create(
-        abbreviation="BMS",
-        defaults={"name": "BMS", "hierarchy_level": 1, "full_abbreviation": "UT-BMS"},
-    )
     item = await CopyrightItem.objects.acreate(
         material_id=101,
         url="http://canvas/files/101",
         file_exists=True,
-        faculty=faculty,
+        faculty=bms_faculty,
     )
 
-    meta = await PDFCanvasMetadata.objects.acreate(
-        uuid="uuid101",
-        display_name="test101.pdf",
-        filename="test101.pdf",
-        size=10,
-        canvas_created_at="2024-01-01T00:00:00Z",
-        canvas_updated_at="2024-01-01T00:00:00Z",
-        locked=False,
-        hidden=False,
-        visibility_level="public",
-        download_url="http://example.com/101"
-    )
+    meta = await metadata_factory(101)
 
     # Create a dummy file
     file_path = tmp_path / "test101.pdf"
-    file_path.write_bytes(b"content")
+    file_path.write_bytes(pdf_blob[0])
 
     doc = await create_or_link_document(item, file_path, meta)
 
@@ -159,3 +212,34 @@ async def test_successful_create_document_commits(tmp_path):
 
     await item.arefresh_from_db()
     assert item.document_id == doc.id
+    assert item.filehash == pdf_blob[1]
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_link_existing_document_reuses_stored_file(
+    tmp_path, bms_faculty, metadata_factory, pdf_blob
+):
+    """
+    Test that a download matching an existing hash links the existing document.
+    """
+    content, filehash = pdf_blob
+    meta = await metadata_factory(102)
+    existing = await Document.objects.acreate(
+        canvas_metadata=meta, filehash=filehash, filename="test102.pdf"
+    )
+    item = await CopyrightItem.objects.acreate(
+        material_id=102,
+        url="http://canvas/files/102",
+        file_exists=True,
+        faculty=bms_faculty,
+    )
+
+    file_path = tmp_path / "test102.pdf"
+    file_path.write_bytes(content)
+
+    doc = await create_or_link_document(item, file_path, meta)
+
+    assert doc.id == existing.id
+    assert await Document.objects.acount() == 1
+    await item.arefresh_from_db()
+    assert item.document_id == existing.id
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-17 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_alter_qlikitem_classification_and_more"),
+        ("enrichment", "0003_alter_enrichmentresult_status"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="enrichmentresult",
+            index=models.Index(
+                fields=["batch", "status"], name="enrichment__batch_i_8c132f_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="enrichmentresult",
+            index=models.Index(
+                fields=["item", "-created_at"], name="enrichment__item_id_75d77f_idx"
+            ),
+        ),
+    ]
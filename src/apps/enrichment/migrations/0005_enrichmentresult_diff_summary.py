@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("enrichment", "0004_enrichmentresult_enrichment__batch_i_8c132f_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="enrichmentresult",
+            name="diff_summary",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
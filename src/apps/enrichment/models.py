@@ -1,3 +1,4 @@
+import orjson
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -62,8 +63,53 @@ class EnrichmentResult(TimestampedModel):
     error_log = models.TextField(null=True, blank=True)
 
     # Snapshots stores relations: { "courses": [...], "teachers": [...], "has_document": bool }
+    # JSONField is JSONB on Postgres; values are stored parsed, not as text.
     data_before = models.JSONField(null=True, blank=True)
     data_after = models.JSONField(null=True, blank=True)
+    # What enrichment added, derived from the snapshots once when finalized:
+    # { "new_courses": [...], "new_teachers": [...], "pdf_added": bool }
+    diff_summary = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Batch progress/status lookups
+            models.Index(fields=["batch", "status"]),
+            # Latest result per item (status partials, dashboard detail)
+            models.Index(fields=["item", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"Result {self.id} - Item {self.item_id} ({self.status})"
+
+    def set_snapshot(self, field: str, snapshot: dict) -> None:
+        """
+        Store a relations snapshot on `data_before` or `data_after`.
+
+        The snapshot is round-tripped through orjson with sorted keys, so the
+        in-memory value matches what is read back from the database and
+        non-JSON values fail here rather than at save time.
+        """
+        if field not in ("data_before", "data_after"):
+            raise ValueError(f"Not a snapshot field: {field}")
+        canonical = orjson.dumps(snapshot, option=orjson.OPT_SORT_KEYS)
+        setattr(self, field, orjson.loads(canonical))
+
+    def set_diff_summary(self) -> None:
+        """Store what enrichment added between the two snapshots on `diff_summary`."""
+        before = self.data_before or {}
+        after = self.data_after or {}
+
+        before_courses = {c["code"] for c in before.get("courses", [])}
+        after_courses = {c["code"]: c["name"] for c in after.get("courses", [])}
+        new_teachers = set(after.get("teachers", [])) - set(before.get("teachers", []))
+
+        self.diff_summary = {
+            "new_courses": [
+                name
+                for code, name in after_courses.items()
+                if code not in before_courses
+            ],
+            "new_teachers": sorted(new_teachers),
+            "pdf_added": not before.get("has_document")
+            and bool(after.get("has_document")),
+        }
@@ -1,33 +1,108 @@
+import asyncio
+import functools
 import urllib.parse
+import weakref
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-import bs4
 import httpx
-import Levenshtein
+import orjson
 from django.conf import settings
+from django.core.cache import cache
 from loguru import logger
+from xxhash import xxh3_64_hexdigest
+
+# One pooled client per event loop: connections are bound to the loop that opened
+# them, and tasks/commands may each run in their own short-lived loop.
+_shared_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP/2 client for the running event loop.
+
+    Reusing the client keeps TLS connections to Osiris and the people pages alive
+    across scraper instances instead of doing a new handshake per session.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=settings.OSIRIS_HEADERS,
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+        _shared_clients[loop] = client
+    return client
+
+
+@functools.lru_cache(maxsize=4096)
+def _norm(name: str) -> str:
+    """Normalize a name for similarity scoring; tile names recur across a batch."""
+    return name.lower().strip()
 
 
 class OsirisScraperService:
     """
     Service for fetching and parsing course and person data from Osiris and People Page.
+
+    Uses the shared client from `get_shared_client()` unless a client is passed in;
+    only an explicitly passed client is closed on exit.
     """
 
     def __init__(self, client: httpx.AsyncClient | None = None):
-        self.client = client or httpx.AsyncClient(
-            headers=settings.OSIRIS_HEADERS, timeout=30.0
-        )
+        self._client = client
         self.base_url = settings.OSIRIS_BASE_URL
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_shared_client()
+
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def _cached(
+        self, key: str, fetch: Callable[[], Awaitable[tuple[dict[str, Any], bool]]]
+    ) -> dict[str, Any]:
+        """
+        Return a cached lookup, fetching and storing it on a miss.
+
+        ``fetch`` returns the result and whether it is complete. Only complete,
+        non-empty results are stored: the fetchers return {} on request errors
+        and partial data when a follow-up request failed, and those should be
+        retried on the next run.
+        """
+        data = await cache.aget(key)
+        if data is not None:
+            return data
+        data, complete = await fetch()
+        if data and complete:
+            await cache.aset(key, data, settings.OSIRIS_CACHE_TIMEOUT)
+        return data
 
     async def fetch_course_details(self, course_code: int) -> dict[str, Any]:
+        """
+        Fetch course data from Osiris, cached for OSIRIS_CACHE_TIMEOUT.
+        """
+        return await self._cached(
+            f"osiris:course:{course_code}",
+            lambda: self._fetch_course_details(course_code),
+        )
+
+    async def _fetch_course_details(
+        self, course_code: int
+    ) -> tuple[dict[str, Any], bool]:
         """
         Fetch course data from Osiris.
+
+        Returns the course and whether its contacts and teachers were fetched.
         """
         logger.info(f"Fetching course data for {course_code}...")
 
@@ -52,17 +127,16 @@ class OsirisScraperService:
             headers.update(
                 {
                     "host": "utwente.osiris-student.nl",
-                    "connection": "keep-alive",
                     "content-length": str(len(body)),
                 }
             )
             response = await self.client.post(search_url, content=body, headers=headers)
             response.raise_for_status()
-            results = response.json().get("hits", {}).get("hits", [])
+            results = orjson.loads(response.content).get("hits", {}).get("hits", [])
 
             if not results:
                 logger.warning(f"No results found for course {course_code}")
-                return {}
+                return {}, False
 
             raw_data = results[0].get("_source", {})
             internal_id = raw_data.get("id_cursus")
@@ -81,60 +155,98 @@ class OsirisScraperService:
             }
 
             # If we have an internal ID, fetch details (contacts/teachers)
+            complete = True
             if internal_id:
-                await self._fetch_extended_course_details(course_info)
+                complete = await self._fetch_extended_course_details(course_info)
 
-            return course_info
+            return course_info, complete
 
         except Exception as e:
             logger.error(f"Error fetching course {course_code}: {e}")
-            return {}
+            return {}, False
 
-    async def _fetch_extended_course_details(self, course_info: dict[str, Any]):
-        """Fetch detailed course page to extract contacts and teachers."""
+    async def _fetch_extended_course_details(self, course_info: dict[str, Any]) -> bool:
+        """
+        Fetch detailed course page to extract contacts and teachers.
+
+        Returns False if the page could not be fetched or parsed.
+        """
         internal_id = course_info["internal_id"]
         url = f"{self.base_url}/student/osiris/owc/cursussen/{internal_id}"
 
         try:
             headers = self.client.headers.copy()
-            headers.update(
+            headers.update({"host": "utwente.osiris-student.nl"})
+            response = await self.client.get(url, headers=headers)
+            response.raise_for_status()
+            details = orjson.loads(response.content)
+
+            docenten = next(
+                (
+                    item
+                    for item in details.get("items", [])
+                    if item.get("rubriek") == "rubriek-docenten"
+                ),
+                None,
+            )
+            role_groups = (
+                [
+                    role_group
+                    for veld in docenten.get("velden", [])
+                    for role_group in veld.get("waarde", [])
+                ]
+                if docenten
+                else []
+            )
+
+            # Sets dedupe repeated names; stored as lists for later handling
+            course_info["contacts"] = list(
                 {
-                    "host": "utwente.osiris-student.nl",
-                    "connection": "keep-alive",
+                    entry["docent"]
+                    for role_group in role_groups
+                    if role_group.get("omschrijving") == "Contactpersoon"
+                    for entry in role_group.get("velden", [])
+                    if entry.get("docent")
                 }
             )
-            response = await self.client.get(url, headers=headers)
-            response.raise_for_status()
-            details = response.json()
-
-            for item in details.get("items", []):
-                if item.get("rubriek") == "rubriek-docenten":
-                    velden = item.get("velden", [])
-                    for veld in velden:
-                        waarde = veld.get("waarde", [])
-                        for role_group in waarde:
-                            role_name = role_group.get("omschrijving")
-                            for person_entry in role_group.get("velden", []):
-                                person_name = person_entry.get("docent")
-                                if person_name:
-                                    if role_name == "Contactpersoon":
-                                        course_info["contacts"].add(person_name)
-                                    else:
-                                        course_info["teachers"].add(person_name)
-
-            # Convert sets to lists for better handling later
-            course_info["teachers"] = list(course_info["teachers"])
-            course_info["contacts"] = list(course_info["contacts"])
+            course_info["teachers"] = list(
+                {
+                    entry["docent"]
+                    for role_group in role_groups
+                    if role_group.get("omschrijving") != "Contactpersoon"
+                    for entry in role_group.get("velden", [])
+                    if entry.get("docent")
+                }
+            )
+            return True
 
         except Exception as e:
             logger.warning(
                 f"Could not fetch extended details for course {internal_id}: {e}"
             )
+            return False
 
     async def fetch_person_data(self, person_name: str) -> dict[str, Any]:
+        """
+        Fetch person data from people.utwente.nl, cached for OSIRIS_CACHE_TIMEOUT.
+        """
+
+        async def fetch() -> tuple[dict[str, Any], bool]:
+            return await self._fetch_person_data(person_name), True
+
+        return await self._cached(
+            f"osiris:person:{xxh3_64_hexdigest(person_name.encode())}", fetch
+        )
+
+    async def _fetch_person_data(self, person_name: str) -> dict[str, Any]:
         """
         Fetch person data from people.utwente.nl.
         """
+        # Imported here: only the people-page lookup needs HTML parsing and fuzzy
+        # matching, so processes that never enrich do not pay for the imports.
+        import bs4
+        from rapidfuzz import fuzz, process
+
         logger.info(f"Searching for person: {person_name}")
 
         headers = {
@@ -149,38 +261,38 @@ class OsirisScraperService:
             response = await self.client.get(search_url, headers=headers)
             response.raise_for_status()
 
-            soup = bs4.BeautifulSoup(response.text, "lxml")
-            tiles = soup.find_all("div", class_="ut-person-tile")
+            # Only build the tile subtrees; everything else on the page is skipped
+            strainer = bs4.SoupStrainer("div", class_="ut-person-tile")
+            soup = bs4.BeautifulSoup(response.text, "lxml", parse_only=strainer)
+            tiles = soup.find_all("div", class_="ut-person-tile", limit=5)
 
             if not tiles:
                 logger.warning(f"No person tiles found for {person_name}")
                 return {}
 
-            # Score matches using Levenshtein (simplified version of legacy logic)
-            matches = []
-            compare_name = person_name.lower().strip()
-
-            for tile in tiles[:5]:
+            # Score matches on name similarity (simplified version of legacy logic)
+            names = []
+            urls = []
+            for tile in tiles:
                 name_tag = tile.find("h3", class_="ut-person-tile__title")
-                if not name_tag:
-                    continue
-
-                full_name = name_tag.get_text(strip=True)
                 data_link = tile.get("data-link")
-                if not data_link:
+                if not name_tag or not data_link:
                     continue
+                names.append(name_tag.get_text(strip=True))
+                urls.append(f"https://people.utwente.nl/{data_link}")
 
-                url = f"https://people.utwente.nl/{data_link}"
-
-                # Basic ratio check
-                ratio = Levenshtein.ratio(full_name.lower(), compare_name)
-                matches.append({"name": full_name, "url": url, "ratio": ratio})
-
-            if not matches:
+            best = process.extractOne(
+                person_name, names, scorer=fuzz.ratio, processor=_norm
+            )
+            if best is None:
                 return {}
 
-            matches.sort(key=lambda x: x["ratio"], reverse=True)
-            best_match = matches[0]
+            _, score, index = best
+            best_match = {
+                "name": names[index],
+                "url": urls[index],
+                "ratio": score / 100,
+            }
 
             if best_match["ratio"] < 0.5:
                 logger.warning(
@@ -194,11 +306,8 @@ class OsirisScraperService:
             detail_soup = bs4.BeautifulSoup(detail_response.text, "lxml")
 
             # Extract email
-            email = ""
-            for a in detail_soup.find_all("a", href=True):
-                if str(a["href"]).startswith("mailto:"):
-                    email = str(a["href"]).replace("mailto:", "")
-                    break
+            mailto = detail_soup.select_one('a[href^="mailto:"]')
+            email = str(mailto["href"]).removeprefix("mailto:") if mailto else ""
 
             # Extract organizations
             orgs = []
@@ -0,0 +1,95 @@
+"""
+Status change notifications for enrichment items.
+
+Workers publish on a Redis channel per item when an item's enrichment finishes,
+so status badges can wait for that event over server-sent events instead of
+polling. Redis is optional here, as it is for the cache: failures are logged
+and waiting callers simply time out.
+"""
+
+import asyncio
+import contextlib
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+import redis.asyncio as redis
+from django.conf import settings
+from loguru import logger
+
+# One client per event loop, for the same reason as the Osiris HTTP client:
+# connections are bound to the loop that opened them.
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def status_channel(material_id: int) -> str:
+    """Return the pub/sub channel for status changes of one item."""
+    return f"{settings.CACHE_KEY_PREFIX}:enrichment:status:{material_id}"
+
+
+def get_client() -> redis.Redis:
+    """Return the Redis client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = redis.Redis.from_url(
+            settings.CACHES["default"]["LOCATION"], socket_connect_timeout=1
+        )
+        _clients[loop] = client
+    return client
+
+
+async def publish_status_change(material_ids: Iterable[int]) -> None:
+    """Notify listeners that the enrichment status of these items changed."""
+    try:
+        async with get_client().pipeline(transaction=False) as pipe:
+            for material_id in material_ids:
+                pipe.publish(status_channel(material_id), "changed")
+            await pipe.execute()
+    except (redis.RedisError, OSError) as e:
+        logger.debug(f"Could not publish enrichment status change: {e}")
+
+
+@contextlib.asynccontextmanager
+async def status_subscription(
+    material_id: int,
+) -> AsyncIterator[Callable[[float], Awaitable[bool]]]:
+    """
+    Subscribe to status changes of one item.
+
+    Yields ``wait(timeout)``, which returns True once a change was published
+    and False on timeout. Subscribing happens on entry, so a caller can check
+    the current status afterwards without missing a change in between. When
+    Redis is unavailable, ``wait`` returns False right away.
+    """
+    pubsub = get_client().pubsub(ignore_subscribe_messages=True)
+    try:
+        await pubsub.subscribe(status_channel(material_id))
+    except (redis.RedisError, OSError) as e:
+        logger.debug(f"Could not subscribe to enrichment status changes: {e}")
+
+        async def unavailable(timeout: float) -> bool:
+            return False
+
+        yield unavailable
+        return
+
+    async def wait(timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                message = await pubsub.get_message(timeout=remaining)
+            except (redis.RedisError, OSError) as e:
+                logger.debug(f"Lost enrichment status subscription: {e}")
+                return False
+            if message is not None:
+                return True
+        return False
+
+    try:
+        yield wait
+    finally:
+        with contextlib.suppress(redis.RedisError, OSError):
+            await pubsub.aclose()
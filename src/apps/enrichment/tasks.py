@@ -1,5 +1,13 @@
+import asyncio
+import contextlib
+import functools
+import re
+import time
+from collections import defaultdict
 from typing import Any
 
+from django.conf import settings
+from django.db.models import QuerySet, aprefetch_related_objects
 from django.tasks import task
 from django.utils import timezone
 from loguru import logger
@@ -7,68 +15,86 @@ from loguru import logger
 from apps.core.models import CopyrightItem, EnrichmentStatus
 from apps.core.utils.safecast import safe_int
 from apps.documents.services.download import download_undownloaded_pdfs
-from apps.documents.services.parse import parse_pdfs
+from apps.documents.services.parse import PARSE_CONCURRENCY, parse_pdfs
 from apps.enrichment.services.osiris_scraper import OsirisScraperService
+from apps.enrichment.services.status_events import publish_status_change
 
 OSIRIS_COURSE_CODE_LENGTH = 9
-
-
-async def _get_item_snapshot(item: CopyrightItem) -> dict:
-    """Helper to capture a snapshot of an item's relations."""
-    courses = []
-    async for c in item.courses.all():
-        courses.append({"code": c.cursuscode, "name": c.name})
-
-    teachers = []
-    async for c in item.courses.all():
-        async for teacher in c.teachers.all():
-            teachers.append(teacher.main_name or teacher.input_name)
-
+# A standalone run of exactly OSIRIS_COURSE_CODE_LENGTH digits
+_COURSE_RE = re.compile(rf"(?<!\d)(\d{{{OSIRIS_COURSE_CODE_LENGTH}}})(?!\d)")
+# Items per enrich_items_batch task; keeps one worker from holding a whole batch
+ENRICHMENT_CHUNK_SIZE = 32
+# Downloaded-but-unparsed PDFs buffered between the two document stages
+PDF_PIPELINE_QUEUE_SIZE = 32
+# Relations read by _get_item_snapshot; prefetch these before taking a snapshot
+SNAPSHOT_PREFETCH = "courses__teachers"
+
+
+def _get_item_snapshot(item: CopyrightItem) -> dict:
+    """Capture a snapshot of an item's relations.
+
+    The item must be loaded with ``prefetch_related(SNAPSHOT_PREFETCH)`` so the
+    walk below is served from the prefetch cache without further queries.
+    """
+    courses = item.courses.all()
     return {
-        "courses": courses,
-        "teachers": list(set(teachers)),
+        "courses": [{"code": c.cursuscode, "name": c.name} for c in courses],
+        "teachers": list(
+            {t.main_name or t.input_name for c in courses for t in c.teachers.all()}
+        ),
         "has_document": item.document_id is not None,
     }
 
 
+@functools.lru_cache(maxsize=8192)
 def parse_course_id(course_code_str: str) -> int | None:
-    """Parse a valid Osiris course ID from various string formats."""
-    raw_codes = course_code_str.split("|")
-    for raw in raw_codes:
+    """Parse a valid Osiris course ID from various string formats.
+
+    Results are cached: many items in a batch share the same course code.
+    """
+    # Common case: the field holds just the code, no regex scan needed
+    code = course_code_str
+    if len(code) == OSIRIS_COURSE_CODE_LENGTH and code.isascii() and code.isdigit():
+        return int(code)
+    for raw in course_code_str.split("|"):
+        if match := _COURSE_RE.search(raw):
+            return int(match.group(1))
         clean = raw.strip()
-        if "-" in clean:
-            parts = clean.split("-")
-            for part in parts:
-                if len(part) == OSIRIS_COURSE_CODE_LENGTH and part.isdigit():
-                    return int(part)
-        elif clean.isdigit():
+        if clean.isdigit():
             return int(clean)
     return None
 
 
-async def _enrich_person_and_link(
+async def _enrich_person(
     name: str,
-    course: Any,
     scraper: OsirisScraperService,
-    contacts: list[str],
-):
-    """Enrich a person from Osiris and link them to a course."""
-    from apps.core.models import CourseEmployee, Faculty, Organization, Person
+    persons: dict[str, asyncio.Task] | None = None,
+) -> Any | None:
+    """Enrich a person and their organisations from the people pages.
+
+    Returns the Person, or None when no match was found. With a batch-level
+    ``persons`` cache, the first caller registers its lookup as a task before
+    awaiting it, so items enriched concurrently share one fetch and upsert.
+    """
+    if persons is None:
+        return await _fetch_person(name, scraper)
+    if name not in persons:
+        persons[name] = asyncio.create_task(_fetch_person(name, scraper))
+    return await persons[name]
+
+
+async def _fetch_person(name: str, scraper: OsirisScraperService) -> Any | None:
+    """Fetch a person from the people pages and upsert them with their orgs."""
+    from apps.core.models import Faculty, Organization, Person
 
     p_data = await scraper.fetch_person_data(name)
     if not p_data:
-        return
-
-    person, _ = await Person.objects.aupdate_or_create(
-        input_name=name,
-        defaults={
-            "main_name": p_data.get("main_name"),
-            "email": p_data.get("email"),
-            "people_page_url": p_data.get("people_page_url"),
-            "is_verified": True,
-        },
-    )
+        return None
 
+    # Resolve the org chain first so the faculty can go into the single
+    # Person upsert below instead of a second save.
+    faculty = None
+    org_objs = []
     parent_org = None
     full_abbr_parts = []
     for i, org_data in enumerate(p_data.get("orgs", [])):
@@ -87,28 +113,64 @@ async def _enrich_person_and_link(
             org_obj, _ = await Faculty.objects.aupdate_or_create(
                 abbreviation=org_abbr, full_abbreviation=full_abbr, defaults=defaults
             )
-            person.faculty = org_obj
+            faculty = org_obj
         else:
             org_obj, _ = await Organization.objects.aupdate_or_create(
                 abbreviation=org_abbr, full_abbreviation=full_abbr, defaults=defaults
             )
 
-        await person.orgs.aadd(org_obj)
+        org_objs.append(org_obj)
         parent_org = org_obj
 
-    await person.asave()
+    person_defaults = {
+        "main_name": p_data.get("main_name"),
+        "email": p_data.get("email"),
+        "people_page_url": p_data.get("people_page_url"),
+        "is_verified": True,
+    }
+    if faculty is not None:
+        person_defaults["faculty"] = faculty
 
-    role = "contacts" if name in contacts else "teachers"
-    await CourseEmployee.objects.filter(course=course, person=person).adelete()
-    await CourseEmployee.objects.aupdate_or_create(
-        course=course, person=person, defaults={"role": role}
+    person, _ = await Person.objects.aupdate_or_create(
+        input_name=name, defaults=person_defaults
+    )
+    if org_objs:
+        await person.orgs.aadd(*org_objs)
+
+    return person
+
+
+async def _link_persons_to_courses_bulk(links: list[tuple[Any, Any, str]]):
+    """Upsert CourseEmployee rows for (course, person, role) triples at once."""
+    from apps.core.models import CourseEmployee
+
+    if not links:
+        return
+
+    await CourseEmployee.objects.abulk_create(
+        [
+            CourseEmployee(course=course, person=person, role=role)
+            for course, person, role in links
+        ],
+        update_conflicts=True,
+        unique_fields=["course", "person"],
+        update_fields=["role", "modified_at"],
     )
 
 
 async def _enrich_from_osiris(
-    item: CopyrightItem, scraper: OsirisScraperService
+    item: CopyrightItem,
+    scraper: OsirisScraperService,
+    caches: dict[str, dict] | None = None,
 ) -> tuple[bool, list[str]]:
-    """Enrich item relations from Osiris data."""
+    """Enrich item relations from Osiris data.
+
+    ``caches`` comes from ``_preload_batch_caches``; with it, a course shared
+    by several items in a batch is fetched and written only once. The first
+    item registers the course as a task before awaiting it, and the others
+    await that same task, so this also holds for items enriched concurrently.
+    Person errors are reported by that first item only.
+    """
     if not item.course_code:
         return True, []
 
@@ -118,95 +180,327 @@ async def _enrich_from_osiris(
         return True, []
 
     try:
-        course_info = await scraper.fetch_course_details(course_code_int)
-        if not course_info:
-            return True, []
-
-        from apps.core.models import Course, Faculty
-
-        faculty = None
-        if course_info.get("faculty_abbr"):
-            faculty = await Faculty.objects.filter(
-                abbreviation=course_info["faculty_abbr"]
-            ).afirst()
-
-        course, _ = await Course.objects.aupdate_or_create(
-            cursuscode=course_code_int,
-            defaults={
-                "name": course_info.get("name") or "Unknown",
-                "short_name": course_info.get("short_name"),
-                "programme_text": course_info.get("programme"),
-                "faculty": faculty,
-                "internal_id": course_info.get("internal_id"),
-                "year": safe_int(course_info.get("year")) or 2024,
-            },
-        )
+        if caches is None:
+            course, person_errors = await _enrich_course(course_code_int, scraper)
+        elif course_code_int in caches["courses"]:
+            course, _ = await caches["courses"][course_code_int]
+            person_errors = []
+        else:
+            course_task = asyncio.create_task(
+                _enrich_course(course_code_int, scraper, caches)
+            )
+            caches["courses"][course_code_int] = course_task
+            course, person_errors = await course_task
 
-        await item.courses.aadd(course)
+        if course is not None:
+            await item.courses.aadd(course)
+        return True, person_errors
 
-        all_names = set(course_info.get("teachers", [])) | set(
-            course_info.get("contacts", [])
+    except Exception as e:
+        logger.opt(exception=True).error(
+            "Error enriching course for item {}", item.material_id
         )
-        for name in all_names:
-            await _enrich_person_and_link(
-                name, course, scraper, course_info.get("contacts", [])
+        return False, [f"Course enrichment failed: {e!s}"]
+
+
+async def _enrich_course(
+    course_code_int: int,
+    scraper: OsirisScraperService,
+    caches: dict[str, dict] | None = None,
+) -> tuple[Any | None, list[str]]:
+    """Fetch a course from Osiris and upsert it with its staff.
+
+    Returns the Course, or None when Osiris has no such course, together with
+    the errors of staff members that could not be enriched.
+    """
+    from apps.core.models import Course, Faculty
+
+    course_info = await scraper.fetch_course_details(course_code_int)
+    if not course_info:
+        return None, []
+
+    faculty = None
+    faculty_abbr = course_info.get("faculty_abbr")
+    if faculty_abbr and caches is not None:
+        faculty = caches["faculties"].get(faculty_abbr)
+    elif faculty_abbr:
+        faculty = await Faculty.objects.filter(abbreviation=faculty_abbr).afirst()
+
+    course, _ = await Course.objects.aupdate_or_create(
+        cursuscode=course_code_int,
+        defaults={
+            "name": course_info.get("name") or "Unknown",
+            "short_name": course_info.get("short_name"),
+            "programme_text": course_info.get("programme"),
+            "faculty": faculty,
+            "internal_id": course_info.get("internal_id"),
+            "year": safe_int(course_info.get("year")) or 2024,
+        },
+    )
+
+    contacts = frozenset(course_info.get("contacts", []))
+    all_names = list(set(course_info.get("teachers", [])) | contacts)
+    # People pages are fetched concurrently; the semaphore caps how many
+    # requests a single course puts in flight against people.utwente.nl.
+    sem = asyncio.Semaphore(settings.OSIRIS_PERSON_CONCURRENCY)
+
+    async def _bounded(name: str):
+        async with sem:
+            return await _enrich_person(
+                name,
+                scraper,
+                caches["persons"] if caches is not None else None,
             )
 
-        return True, []
+    outcomes = await asyncio.gather(
+        *(_bounded(name) for name in all_names), return_exceptions=True
+    )
+    links = []
+    person_errors = []
+    for name, outcome in zip(all_names, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            logger.opt(exception=outcome).warning(
+                "Error enriching person {!r} for course {}", name, course_code_int
+            )
+            person_errors.append(f"Person enrichment failed for {name}: {outcome!s}")
+        elif outcome is not None:
+            role = "contacts" if name in contacts else "teachers"
+            links.append((course, outcome, role))
+
+    await _link_persons_to_courses_bulk(links)
+
+    return course, person_errors
+
+
+async def _process_batch_documents(item_ids: list[int]) -> dict[int, list[str]]:
+    """Download and parse the PDFs of a batch chunk as a two-stage pipeline.
+
+    The downloader hands every freshly linked document to a bounded queue and
+    parser workers drain it, so parsing overlaps the remaining downloads. A
+    final sweep parses documents that were linked before this batch.
+
+    Returns the errors per item id, for the items they affected.
+    """
+    error_messages: dict[int, list[str]] = defaultdict(list)
+    parse_queue: asyncio.Queue[int | None] = asyncio.Queue(
+        maxsize=PDF_PIPELINE_QUEUE_SIZE
+    )
+    # Items sharing a file share a Document; it is parsed only once
+    document_items: dict[int, list[int]] = {}
 
+    async def enqueue_parse(item: CopyrightItem):
+        if item.document_id in document_items:
+            document_items[item.document_id].append(item.material_id)
+        else:
+            document_items[item.document_id] = [item.material_id]
+            await parse_queue.put(item.document_id)
+
+    async def parse_worker():
+        while (document_id := await parse_queue.get()) is not None:
+            material_ids = document_items[document_id]
+            try:
+                await parse_pdfs(filter_ids=material_ids[:1])
+            except Exception as e:
+                logger.opt(exception=True).error(
+                    "Error parsing PDF for item {}", material_ids[0]
+                )
+                for material_id in material_ids:
+                    error_messages[material_id].append(f"PDF Parsing failed: {e!s}")
+
+    workers = [asyncio.create_task(parse_worker()) for _ in range(PARSE_CONCURRENCY)]
+    try:
+        await download_undownloaded_pdfs(
+            limit=len(item_ids), filter_ids=item_ids, on_downloaded=enqueue_parse
+        )
     except Exception as e:
-        logger.exception(f"Error enriching course for item {item.material_id}")
-        return False, [f"Course enrichment failed: {e!s}"]
+        logger.opt(exception=True).error(
+            "Error downloading PDFs for items {}", item_ids
+        )
+        for material_id in item_ids:
+            error_messages[material_id].append(f"PDF Download failed: {e!s}")
+    finally:
+        for _ in workers:
+            await parse_queue.put(None)
+        await asyncio.gather(*workers)
+
+    try:
+        await parse_pdfs(filter_ids=item_ids)
+    except Exception as e:
+        logger.opt(exception=True).error("Error parsing PDFs for items {}", item_ids)
+        for material_id in item_ids:
+            error_messages[material_id].append(f"PDF Parsing failed: {e!s}")
+
+    return dict(error_messages)
 
 
 async def _process_documents(item: CopyrightItem):
-    """Handle PDF downloading and parsing for an item."""
+    """Handle PDF downloading and parsing for a single item.
+
+    A document linked by the downloader is copied onto ``item`` in memory, so
+    callers do not need to re-read it. Batch enrichment uses
+    ``_process_batch_documents`` instead.
+    """
     error_messages = []
 
+    async def link_document(downloaded: CopyrightItem):
+        item.document_id = downloaded.document_id
+
     if item.url and "/files/" in item.url:
         try:
-            await download_undownloaded_pdfs(limit=0)
+            await download_undownloaded_pdfs(
+                filter_ids=[item.material_id], on_downloaded=link_document
+            )
         except Exception as e:
-            logger.exception(f"Error downloading PDF for item {item.material_id}")
+            logger.opt(exception=True).error(
+                "Error downloading PDF for item {}", item.material_id
+            )
             error_messages.append(f"PDF Download failed: {e!s}")
 
     try:
-        # Re-fetch item to see if document was attached by downloader
-        item_re = await CopyrightItem.objects.aget(material_id=item.material_id)
-        await parse_pdfs(filter_ids=[item_re.material_id])
+        await parse_pdfs(filter_ids=[item.material_id])
     except Exception as e:
-        logger.exception(f"Error parsing PDF for item {item.material_id}")
+        logger.opt(exception=True).error(
+            "Error parsing PDF for item {}", item.material_id
+        )
         error_messages.append(f"PDF Parsing failed: {e!s}")
 
     return error_messages
 
 
-async def _update_batch_status(
-    batch_id: int, enrichment_successful: bool, total_items: int
-):
-    """Update progress and status for an enrichment batch."""
-    from django.db.models import F
+async def _update_batch_status(batch_id: int, processed: int = 0, failed: int = 0):
+    """Update progress and status for an enrichment batch.
+
+    Counting the items and completing the batch happen in one UPDATE. The SET
+    expressions see the row as it was before the update, so the batch is
+    done when the counters plus these items reach ``total_items``.
+    """
+    from django.db.models import Case, F, Q, Value, When
 
     from apps.enrichment.models import EnrichmentBatch
 
-    if enrichment_successful:
-        await EnrichmentBatch.objects.filter(id=batch_id).aupdate(
-            processed_items=F("processed_items") + 1
-        )
-    else:
-        await EnrichmentBatch.objects.filter(id=batch_id).aupdate(
-            failed_items=F("failed_items") + 1
-        )
+    counted = processed + failed
+    done = Q(total_items__lte=F("processed_items") + F("failed_items") + counted) & ~Q(
+        status=EnrichmentBatch.Status.COMPLETED
+    )
 
-    # Check if batch is done
-    updated_batch = await EnrichmentBatch.objects.aget(id=batch_id)
-    if (
-        updated_batch.processed_items + updated_batch.failed_items
-        >= updated_batch.total_items
-    ):
-        updated_batch.status = EnrichmentBatch.Status.COMPLETED
-        updated_batch.completed_at = timezone.now()
-        await updated_batch.asave()
+    await EnrichmentBatch.objects.filter(id=batch_id).aupdate(
+        processed_items=F("processed_items") + processed,
+        failed_items=F("failed_items") + failed,
+        status=Case(
+            When(done, then=Value(EnrichmentBatch.Status.COMPLETED)),
+            default=F("status"),
+        ),
+        completed_at=Case(
+            When(done, then=Value(timezone.now())),
+            default=F("completed_at"),
+        ),
+    )
+
+
+async def _set_batch_total(batch_id: int, total_items: int):
+    """Set the final item count of an enrichment batch.
+
+    Its items may all have finished while the rest were still being enqueued,
+    so the batch is completed here when its counters already reach the total.
+    A batch completed early against a smaller estimate is set running again.
+    """
+    from django.db.models import Case, F, Q, Value, When
+    from django.db.models.lookups import GreaterThanOrEqual
+
+    from apps.enrichment.models import EnrichmentBatch
+
+    done = GreaterThanOrEqual(F("processed_items") + F("failed_items"), total_items)
+    await EnrichmentBatch.objects.filter(id=batch_id).aupdate(
+        total_items=total_items,
+        status=Case(
+            When(done, then=Value(EnrichmentBatch.Status.COMPLETED)),
+            default=Value(EnrichmentBatch.Status.RUNNING),
+        ),
+        completed_at=Case(
+            When(done & Q(completed_at__isnull=False), then=F("completed_at")),
+            When(done, then=Value(timezone.now())),
+            default=None,
+        ),
+    )
+
+
+class FinalizationBuffer:
+    """Collect the final writes of a batch chunk and flush them in bulk.
+
+    Items and results are written with one bulk UPDATE each, and the batch
+    counters with a single ``_update_batch_status`` call, instead of three
+    statements per item. Results are built from their id alone: the fields
+    written on flush are all set by ``_finalize_enrichment``.
+
+    Finished items stay RUNNING, without a status event, until their flush.
+    So the buffer flushes once it holds FLUSH_SIZE items or its oldest item
+    has waited FLUSH_INTERVAL seconds, not only when the chunk ends. That
+    check happens when an item is added; the rest is flushed on exit.
+    """
+
+    ITEM_FIELDS = ["enrichment_status", "last_enrichment_attempt"]
+    RESULT_FIELDS = ["status", "data_after", "diff_summary", "error_log"]
+    FLUSH_SIZE = 8
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, batch_id: int | None = None):
+        self.batch_id = batch_id
+        self.items: list[CopyrightItem] = []
+        self.results: list[Any] = []
+        self.processed = 0
+        self.failed = 0
+        self.oldest: float | None = None
+
+    async def __aenter__(self) -> "FinalizationBuffer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.flush()
+
+    async def add(
+        self, item: CopyrightItem, result: Any, enrichment_successful: bool
+    ) -> None:
+        now = time.monotonic()
+        if self.oldest is None:
+            self.oldest = now
+        self.items.append(item)
+        if result is not None:
+            self.results.append(result)
+        if enrichment_successful:
+            self.processed += 1
+        else:
+            self.failed += 1
+        if (
+            len(self.items) >= self.FLUSH_SIZE
+            or now - self.oldest >= self.FLUSH_INTERVAL
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        from apps.enrichment.models import EnrichmentResult
+
+        # Take the pending writes before the first await, so items added by
+        # other coroutines meanwhile go into the next flush.
+        items, results = self.items, self.results
+        processed, failed = self.processed, self.failed
+        self.items, self.results = [], []
+        self.processed = self.failed = 0
+        self.oldest = None
+
+        if items:
+            await CopyrightItem.objects.abulk_update(
+                items, self.ITEM_FIELDS, batch_size=500
+            )
+        if results:
+            await EnrichmentResult.objects.abulk_update(
+                results, self.RESULT_FIELDS, batch_size=500
+            )
+        if self.batch_id and (processed or failed):
+            await _update_batch_status(
+                self.batch_id, processed=processed, failed=failed
+            )
+        if items:
+            await publish_status_change(item.material_id for item in items)
 
 
 async def _finalize_enrichment(
@@ -215,55 +509,107 @@ async def _finalize_enrichment(
     error_messages: list[str],
     result_id: int | None = None,
     batch_id: int | None = None,
+    buffer: FinalizationBuffer | None = None,
+    data_before: dict | None = None,
 ):
-    """Save final state of item and enrichment result."""
-    from apps.enrichment.models import EnrichmentResult
+    """Save final state of item and enrichment result.
 
-    # Re-fetch item for final snapshot
-    item = await CopyrightItem.objects.select_related("document").aget(
-        material_id=item.material_id
-    )
-    data_after = await _get_item_snapshot(item)
+    ``item`` is the instance loaded by ``_enrich_one``: document processing
+    keeps its document_id current, and the aadd() calls during enrichment
+    invalidated its prefetched courses, so no re-fetch is needed.
+
+    With a ``buffer`` the writes are queued for its next flush instead, and
+    the result is built from ``result_id`` and the ``data_before`` snapshot.
+    """
+    from apps.enrichment.models import EnrichmentResult
 
     item.enrichment_status = (
         EnrichmentStatus.COMPLETED if enrichment_successful else EnrichmentStatus.FAILED
     )
     item.last_enrichment_attempt = timezone.now()
-    await item.asave(update_fields=["enrichment_status", "last_enrichment_attempt"])
 
+    result = None
     if result_id:
-        result = await EnrichmentResult.objects.filter(id=result_id).afirst()
+        if buffer is not None:
+            result = EnrichmentResult(id=result_id, data_before=data_before)
+        else:
+            result = await EnrichmentResult.objects.filter(id=result_id).afirst()
         if result:
+            await aprefetch_related_objects([item], SNAPSHOT_PREFETCH)
             result.status = (
                 EnrichmentResult.Status.SUCCESS
                 if enrichment_successful
                 else EnrichmentResult.Status.FAILURE
             )
-            result.data_after = data_after
+            result.set_snapshot("data_after", _get_item_snapshot(item))
+            result.set_diff_summary()
             result.error_log = "\n".join(error_messages)
-            await result.asave()
 
+    if buffer is not None:
+        await buffer.add(item, result, enrichment_successful)
+        return
+
+    await item.asave(update_fields=FinalizationBuffer.ITEM_FIELDS)
+    if result:
+        await result.asave()
+    await publish_status_change([item.material_id])
     if batch_id:
-        await _update_batch_status(batch_id, enrichment_successful, item.material_id)
+        await _update_batch_status(
+            batch_id,
+            processed=int(enrichment_successful),
+            failed=int(not enrichment_successful),
+        )
 
 
-@task
-async def enrich_item(
-    item_id: int, batch_id: int | None = None, result_id: int | None = None
+async def _preload_batch_caches() -> dict[str, dict]:
+    """Build the lookup tables shared by all items of one enrichment batch.
+
+    Faculties are loaded once up front. Courses (by cursuscode) and persons
+    (by input name) start empty and are filled with the tasks that enrich
+    them while the batch runs.
+    """
+    from apps.core.models import Faculty
+
+    faculties = {}
+    async for faculty in Faculty.objects.order_by("pk"):
+        faculties.setdefault(faculty.abbreviation, faculty)
+
+    return {"faculties": faculties, "courses": {}, "persons": {}}
+
+
+async def _enrich_one(
+    item_id: int,
+    batch_id: int | None = None,
+    result_id: int | None = None,
+    caches: dict[str, dict] | None = None,
+    scraper: OsirisScraperService | None = None,
+    document_errors: list[str] | None = None,
+    buffer: FinalizationBuffer | None = None,
+    data_before: dict | None = None,
 ):
-    """Enrich a single item with Osiris data and download PDF."""
+    """Enrich a single item with Osiris data and download PDF.
+
+    Batch callers pass their own open ``scraper``, a ``buffer`` for the final
+    writes, the ``data_before`` snapshot they took before processing the
+    chunk's PDFs, and the ``document_errors`` of that processing. Otherwise a
+    scraper is opened for this item only and its PDF is downloaded and parsed
+    here.
+    """
     from apps.enrichment.models import EnrichmentResult
 
     try:
-        item = await CopyrightItem.objects.select_related("document").aget(
-            material_id=item_id
-        )
+        items = CopyrightItem.objects.select_related("document")
+        take_snapshot = result_id and data_before is None
+        if take_snapshot:
+            items = items.prefetch_related(SNAPSHOT_PREFETCH)
+        item = await items.aget(material_id=item_id)
 
-        if result_id:
+        if take_snapshot:
             result = await EnrichmentResult.objects.filter(id=result_id).afirst()
             if result:
-                result.data_before = await _get_item_snapshot(item)
+                result.set_snapshot("data_before", _get_item_snapshot(item))
                 await result.asave(update_fields=["data_before"])
+                data_before = result.data_before
 
         item.enrichment_status = EnrichmentStatus.RUNNING
         await item.asave(update_fields=["enrichment_status"])
@@ -271,25 +617,38 @@ async def enrich_item(
         enrichment_successful = True
         error_messages = []
 
-        async with OsirisScraperService() as scraper:
-            success, osiris_errors = await _enrich_from_osiris(item, scraper)
+        async with (
+            contextlib.nullcontext(scraper) if scraper else OsirisScraperService()
+        ) as scraper:
+            success, osiris_errors = await _enrich_from_osiris(item, scraper, caches)
             if not success:
                 enrichment_successful = False
-                error_messages.extend(osiris_errors)
+            error_messages.extend(osiris_errors)
 
-            doc_errors = await _process_documents(item)
-            error_messages.extend(doc_errors)
+            if document_errors is None:
+                error_messages.extend(await _process_documents(item))
+            else:
+                error_messages.extend(document_errors)
 
         await _finalize_enrichment(
-            item, enrichment_successful, error_messages, result_id, batch_id
+            item,
+            enrichment_successful,
+            error_messages,
+            result_id,
+            batch_id,
+            buffer,
+            data_before=data_before,
         )
 
     except Exception as e:
-        logger.exception(f"Critical error in enrich_item for {item_id}")
+        logger.opt(exception=True).error(
+            "Critical error in enrich_item for {}", item_id
+        )
         try:
             item = await CopyrightItem.objects.aget(material_id=item_id)
             item.enrichment_status = EnrichmentStatus.FAILED
-            await item.asave(update_fields=["enrichment_status"])
+            item.last_enrichment_attempt = timezone.now()
+            await item.asave(update_fields=FinalizationBuffer.ITEM_FIELDS)
         except Exception as inner_e:
             logger.error(f"Failed to update error status for item {item_id}: {inner_e}")
 
@@ -300,29 +659,172 @@ async def enrich_item(
                 res.error_log = f"Critical error: {e!s}"
                 await res.asave()
 
+        await publish_status_change([item_id])
+
+
+@task
+async def enrich_item(
+    item_id: int, batch_id: int | None = None, result_id: int | None = None
+):
+    """Enrich a single item with Osiris data and download PDF."""
+    await _enrich_one(item_id, batch_id=batch_id, result_id=result_id)
+
+
+async def _record_before_snapshots(
+    item_ids: list[int], result_ids: list[int | None]
+) -> dict[int, dict]:
+    """Store the ``data_before`` snapshot of a chunk's results in bulk.
+
+    Returns the snapshots by item id, for the items that have a result.
+    """
+    from apps.enrichment.models import EnrichmentResult
+
+    result_ids_by_item = {
+        item_id: result_id
+        for item_id, result_id in zip(item_ids, result_ids, strict=True)
+        if result_id
+    }
+    if not result_ids_by_item:
+        return {}
+
+    results = []
+    snapshots = {}
+    async for item in CopyrightItem.objects.filter(
+        material_id__in=result_ids_by_item
+    ).prefetch_related(SNAPSHOT_PREFETCH):
+        result = EnrichmentResult(id=result_ids_by_item[item.material_id])
+        result.set_snapshot("data_before", _get_item_snapshot(item))
+        results.append(result)
+        snapshots[item.material_id] = result.data_before
+    await EnrichmentResult.objects.abulk_update(
+        results, ["data_before"], batch_size=500
+    )
+    return snapshots
+
+
+@task
+async def enrich_items_batch(
+    item_ids: list[int],
+    batch_id: int | None = None,
+    result_ids: list[int] | None = None,
+):
+    """Enrich a chunk of items concurrently, bounded by ENRICHMENT_CONCURRENCY."""
+    result_ids = result_ids or [None] * len(item_ids)
+    sem = asyncio.Semaphore(settings.ENRICHMENT_CONCURRENCY)
+    caches = await _preload_batch_caches()
+    # Snapshot before the PDFs are linked, so the diff can report them
+    snapshots = await _record_before_snapshots(item_ids, result_ids)
+    doc_errors = await _process_batch_documents(item_ids)
+
+    async with (
+        OsirisScraperService() as scraper,
+        FinalizationBuffer(batch_id) as buffer,
+    ):
+
+        async def _bounded(item_id: int, result_id: int | None):
+            async with sem:
+                await _enrich_one(
+                    item_id,
+                    batch_id=batch_id,
+                    result_id=result_id,
+                    caches=caches,
+                    scraper=scraper,
+                    document_errors=doc_errors.get(item_id, []),
+                    buffer=buffer,
+                    data_before=snapshots.get(item_id),
+                )
+
+        outcomes = await asyncio.gather(
+            *(
+                _bounded(item_id, result_id)
+                for item_id, result_id in zip(item_ids, result_ids, strict=True)
+            ),
+            return_exceptions=True,
+        )
+    for item_id, outcome in zip(item_ids, outcomes, strict=True):
+        if isinstance(outcome, Exception):
+            logger.opt(exception=outcome).error(
+                "Unhandled error enriching item {}", item_id
+            )
+
+
+async def _enqueue_enrichment_chunk(material_ids: list[int], e_batch: Any):
+    """Create pending results for a chunk of items and enqueue its batch task."""
+    from apps.enrichment.models import EnrichmentResult
 
-def trigger_batch_enrichment(batch_id: int):
+    results = await EnrichmentResult.objects.abulk_create(
+        [
+            EnrichmentResult(
+                item_id=material_id,
+                batch=e_batch,
+                status=EnrichmentResult.Status.PENDING,
+            )
+            for material_id in material_ids
+        ]
+    )
+    await enrich_items_batch.aenqueue(
+        [res.item_id for res in results],
+        batch_id=e_batch.id,
+        result_ids=[res.id for res in results],
+    )
+
+
+async def enqueue_enrichment(items: QuerySet[CopyrightItem], e_batch: Any) -> int:
+    """Enqueue enrichment of ``items`` as part of ``e_batch``.
+
+    Item IDs are streamed from the database and enqueued chunk by chunk: one
+    bulk INSERT of pending results and one ``enrich_items_batch`` task per
+    ENRICHMENT_CHUNK_SIZE items, so memory use does not grow with ``items``.
+
+    The batch's ``total_items`` is counted before enqueueing, and items may be
+    added or removed in between, so it is reset to the number actually
+    enqueued once the fan-out is done. Returns that number.
+    """
+    enqueued = 0
+    chunk = []
+    async for material_id in items.values_list("material_id", flat=True).aiterator(
+        chunk_size=1000
+    ):
+        chunk.append(material_id)
+        if len(chunk) == ENRICHMENT_CHUNK_SIZE:
+            await _enqueue_enrichment_chunk(chunk, e_batch)
+            enqueued += len(chunk)
+            chunk = []
+    if chunk:
+        await _enqueue_enrichment_chunk(chunk, e_batch)
+        enqueued += len(chunk)
+
+    await _set_batch_total(e_batch.id, enqueued)
+    return enqueued
+
+
+@task
+async def enqueue_manual_batch(batch_id: int):
+    """Enqueue enrichment of all items for a manual batch started from the UI."""
+    from apps.enrichment.models import EnrichmentBatch
+
+    e_batch = await EnrichmentBatch.objects.aget(id=batch_id)
+    await enqueue_enrichment(CopyrightItem.objects.all(), e_batch)
+
+
+async def trigger_batch_enrichment(batch_id: int):
     """Trigger enrichment for all items in an ingestion batch."""
-    from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+    from apps.enrichment.models import EnrichmentBatch
 
     logger.info(f"Triggering enrichment for ingestion batch {batch_id}")
     items = CopyrightItem.objects.filter(change_logs__batch_id=batch_id).distinct()
-    item_ids = list(items.values_list("material_id", flat=True))
+    total_items = await items.acount()
 
-    if not item_ids:
+    if not total_items:
         return
 
     # Create tracked batch
-    e_batch = EnrichmentBatch.objects.create(
+    e_batch = await EnrichmentBatch.objects.acreate(
         source=EnrichmentBatch.Source.QLIK_BATCH,
-        total_items=len(item_ids),
+        total_items=total_items,
         status=EnrichmentBatch.Status.RUNNING,
         started_at=timezone.now(),
         metadata={"ingestion_batch_id": batch_id},
     )
 
-    for material_id in item_ids:
-        res = EnrichmentResult.objects.create(
-            item_id=material_id, batch=e_batch, status=EnrichmentResult.Status.PENDING
-        )
-        enrich_item.enqueue(material_id, batch_id=e_batch.id, result_id=res.id)
+    await enqueue_enrichment(items, e_batch)
@@ -0,0 +1,16 @@
+"""Shared fixtures for enrichment tests."""
+
+import pytest
+
+from apps.core.models import CopyrightItem
+
+
+@pytest.fixture
+def make_item(db):
+    """Return a function that creates a minimal PDF item with the given id."""
+
+    def _create(material_id: int, **fields) -> CopyrightItem:
+        fields = {"title": "Test Item", "filetype": "PDF", **fields}
+        return CopyrightItem.objects.create(material_id=material_id, **fields)
+
+    return _create
@@ -0,0 +1,46 @@
+import pytest
+
+from apps.enrichment.models import EnrichmentResult
+
+
+def test_set_snapshot_stores_canonical_json():
+    result = EnrichmentResult()
+    result.set_snapshot(
+        "data_after",
+        {"teachers": ("B", "A"), "courses": [], "has_document": True},
+    )
+
+    assert result.data_after == {
+        "courses": [],
+        "has_document": True,
+        "teachers": ["B", "A"],
+    }
+    assert list(result.data_after) == ["courses", "has_document", "teachers"]
+
+
+def test_set_snapshot_rejects_unknown_field():
+    with pytest.raises(ValueError):
+        EnrichmentResult().set_snapshot("error_log", {})
+
+
+def test_set_diff_summary_lists_only_additions():
+    result = EnrichmentResult(
+        data_before={
+            "courses": [{"code": 1, "name": "Old"}],
+            "teachers": ["A"],
+            "has_document": False,
+        },
+        data_after={
+            "courses": [{"code": 1, "name": "Old"}, {"code": 2, "name": "New"}],
+            "teachers": ["C", "A", "B"],
+            "has_document": True,
+        },
+    )
+
+    result.set_diff_summary()
+
+    assert result.diff_summary == {
+        "new_courses": ["New"],
+        "new_teachers": ["B", "C"],
+        "pdf_added": True,
+    }
@@ -0,0 +1,191 @@
+import httpx
+import pytest
+from django.core.cache import cache
+
+from apps.enrichment.services.osiris_scraper import (
+    OsirisScraperService,
+    get_shared_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Serve scraper lookups from an empty in-process cache, not the real one."""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+
+
+async def test_shared_client_is_reused_and_not_closed():
+    async with OsirisScraperService() as first:
+        client = first.client
+    async with OsirisScraperService() as second:
+        assert second.client is client
+
+    assert get_shared_client() is client
+    assert not client.is_closed
+    await client.aclose()
+
+
+async def test_explicit_client_is_closed_on_exit():
+    client = httpx.AsyncClient()
+    async with OsirisScraperService(client) as scraper:
+        assert scraper.client is client
+    assert client.is_closed
+
+
+SEARCH_HTML = """
+<html><body>
+<div class="ut-person-tile" data-link="j.jansen">
+  <h3 class="ut-person-tile__title">Jansen, J. (Jan)</h3>
+</div>
+<div class="ut-person-tile" data-link="p.pietersen">
+  <h3 class="ut-person-tile__title">Pietersen, P. (Piet)</h3>
+</div>
+</body></html>
+"""
+
+DETAIL_HTML = """
+<html><body>
+<a href="/contact">Contact</a>
+<a href="mailto:p.pietersen@utwente.nl">p.pietersen@utwente.nl</a>
+<ul class="widget-linklist--smallicons">
+  <li>University of Twente (UT)</li>
+  <li>Faculty of Behavioural Sciences (BMS)</li>
+</ul>
+</body></html>
+"""
+
+
+def _people_transport(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/overview":
+        return httpx.Response(200, text=SEARCH_HTML)
+    if request.url.path == "/p.pietersen":
+        return httpx.Response(200, text=DETAIL_HTML)
+    return httpx.Response(404)
+
+
+async def test_fetch_person_data_picks_best_matching_tile():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_people_transport))
+    async with OsirisScraperService(client) as scraper:
+        data = await scraper.fetch_person_data("Pietersen, P.")
+
+    assert data["main_name"] == "Pietersen, P. (Piet)"
+    assert data["people_page_url"] == "https://people.utwente.nl/p.pietersen"
+    assert 0.5 <= data["match_confidence"] <= 1.0
+    assert data["email"] == "p.pietersen@utwente.nl"
+    assert data["orgs"] == [
+        {"name": "University of Twente", "abbr": "UT"},
+        {"name": "Faculty of Behavioural Sciences", "abbr": "BMS"},
+    ]
+
+
+async def test_fetch_person_data_rejects_low_confidence_match():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_people_transport))
+    async with OsirisScraperService(client) as scraper:
+        assert await scraper.fetch_person_data("Zzyzx Qwerty") == {}
+
+
+COURSE_SEARCH = {
+    "hits": {
+        "hits": [
+            {
+                "_source": {
+                    "id_cursus": 116098,
+                    "cursus_lange_naam": "Gasdynamics",
+                    "cursus_korte_naam": "GD",
+                    "faculteit": "ET",
+                    "collegejaar": 2024,
+                }
+            }
+        ]
+    }
+}
+
+COURSE_DETAILS = {
+    "items": [
+        {"rubriek": "rubriek-algemeen", "velden": []},
+        {
+            "rubriek": "rubriek-docenten",
+            "velden": [
+                {
+                    "waarde": [
+                        {
+                            "omschrijving": "Contactpersoon",
+                            "velden": [{"docent": "Augustijn, D.C.M."}],
+                        },
+                        {
+                            "omschrijving": "Docent",
+                            "velden": [
+                                {"docent": "Augustijn, D.C.M."},
+                                {"docent": "Jansen, J."},
+                                {"docent": None},
+                            ],
+                        },
+                    ]
+                }
+            ],
+        },
+    ]
+}
+
+
+def _osiris_transport(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/cursussen/zoeken"):
+        return httpx.Response(200, json=COURSE_SEARCH)
+    if request.url.path.endswith("/cursussen/116098"):
+        return httpx.Response(200, json=COURSE_DETAILS)
+    return httpx.Response(404)
+
+
+async def test_fetch_course_details_collects_contacts_and_teachers():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_osiris_transport))
+    async with OsirisScraperService(client) as scraper:
+        course = await scraper.fetch_course_details(191154340)
+
+    assert course["internal_id"] == 116098
+    assert course["name"] == "Gasdynamics"
+    assert course["contacts"] == ["Augustijn, D.C.M."]
+    assert sorted(course["teachers"]) == ["Augustijn, D.C.M.", "Jansen, J."]
+
+
+async def test_lookups_are_cached_but_misses_are_not():
+    requests = []
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.host == "people.utwente.nl":
+            return _people_transport(request)
+        return _osiris_transport(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    async with OsirisScraperService(client) as scraper:
+        first = await scraper.fetch_course_details(191154340)
+        assert await scraper.fetch_course_details(191154340) == first
+        assert await scraper.fetch_person_data("Zzyzx Qwerty") == {}
+        assert await scraper.fetch_person_data("Zzyzx Qwerty") == {}
+
+    course_requests = [path for path in requests if "/cursussen/" in path]
+    assert len(course_requests) == 2  # search + details, fetched once
+    assert requests.count("/overview") == 2  # empty result retried
+
+
+async def test_course_without_staff_details_is_not_cached():
+    requests = []
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path.endswith("/cursussen/116098"):
+            return httpx.Response(503)
+        return _osiris_transport(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    async with OsirisScraperService(client) as scraper:
+        first = await scraper.fetch_course_details(191154340)
+        assert first["name"] == "Gasdynamics"
+        assert not first["teachers"]
+        await scraper.fetch_course_details(191154340)
+
+    # The partial course was refetched instead of served from the cache
+    assert len(requests) == 4
@@ -1,3 +1,4 @@
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -10,12 +11,45 @@ from apps.core.models import (
     Faculty,
     Person,
 )
-from apps.enrichment.tasks import enrich_item
+from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+from apps.enrichment.tasks import (
+    SNAPSHOT_PREFETCH,
+    FinalizationBuffer,
+    _get_item_snapshot,
+    _process_batch_documents,
+    _update_batch_status,
+    enqueue_manual_batch,
+    enrich_item,
+    enrich_items_batch,
+    parse_course_id,
+    trigger_batch_enrichment,
+)
+
+
+@pytest.fixture
+def mocked_scraper(monkeypatch):
+    """Replace the Osiris scraper with a mock that serves as its own session."""
+    scraper = AsyncMock()
+    scraper.__aenter__.return_value = scraper
+    monkeypatch.setattr(
+        "apps.enrichment.tasks.OsirisScraperService", lambda *args, **kwargs: scraper
+    )
+    return scraper
+
+
+@pytest.fixture(autouse=True)
+def mock_pdfs(monkeypatch):
+    """Keep the PDF download and parse services off the network and disk."""
+    mocks = SimpleNamespace(download=AsyncMock(), parse=AsyncMock())
+    monkeypatch.setattr(
+        "apps.enrichment.tasks.download_undownloaded_pdfs", mocks.download
+    )
+    monkeypatch.setattr("apps.enrichment.tasks.parse_pdfs", mocks.parse)
+    return mocks
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
-async def test_enrich_item_persistence():
+async def test_enrich_item_persistence(mocked_scraper):
     # Setup: Create a test item
     faculty, _ = await Faculty.objects.aget_or_create(
         abbreviation="EEMCS",
@@ -47,21 +81,11 @@ async def test_enrich_item_persistence():
         "people_page_url": "https://people.utwente.nl/d.c.m.augustijn",
     }
 
-    # Patch the scraper service
-    with patch("apps.enrichment.tasks.OsirisScraperService") as MockScraper:
-        scraper_instance = MockScraper.return_value
-        scraper_instance.__aenter__.return_value = scraper_instance
-        scraper_instance.fetch_course_details = AsyncMock(return_value=mock_course_info)
-        scraper_instance.fetch_person_data = AsyncMock(return_value=mock_person_data)
-
-        # Patch PDF services to avoid actual network/system calls
-        with (
-            patch("apps.enrichment.tasks.download_undownloaded_pdfs", AsyncMock()),
-            patch("apps.enrichment.tasks.parse_pdfs", AsyncMock()),
-            patch("httpx.AsyncClient"),
-        ):
-            # Execute - access underlying function via .func attribute
-            await enrich_item.func(12345)
+    mocked_scraper.fetch_course_details.return_value = mock_course_info
+    mocked_scraper.fetch_person_data.return_value = mock_person_data
+
+    # Execute - access underlying function via .func attribute
+    await enrich_item.func(12345)
 
     # Verify Course persistence
     await item.arefresh_from_db()
@@ -89,8 +113,7 @@ async def test_enrich_item_persistence():
 
 
 @pytest.mark.django_db(transaction=True)
-@pytest.mark.asyncio
-async def test_enrich_item_org_persistence():
+async def test_enrich_item_org_persistence(mocked_scraper):
     # Setup: Create a test item
     _item, _ = await CopyrightItem.objects.aget_or_create(
         material_id=67890,
@@ -117,21 +140,11 @@ async def test_enrich_item_org_persistence():
         ],
     }
 
-    # Patch the scraper service
-    with patch("apps.enrichment.tasks.OsirisScraperService") as MockScraper:
-        scraper_instance = MockScraper.return_value
-        scraper_instance.__aenter__.return_value = scraper_instance
-        scraper_instance.fetch_course_details = AsyncMock(return_value=mock_course_info)
-        scraper_instance.fetch_person_data = AsyncMock(return_value=mock_person_data)
-
-        # Patch PDF services
-        with (
-            patch("apps.enrichment.tasks.download_undownloaded_pdfs", AsyncMock()),
-            patch("apps.enrichment.tasks.parse_pdfs", AsyncMock()),
-            patch("httpx.AsyncClient"),
-        ):
-            # Execute - access underlying function via .func attribute
-            await enrich_item.func(67890)
+    mocked_scraper.fetch_course_details.return_value = mock_course_info
+    mocked_scraper.fetch_person_data.return_value = mock_person_data
+
+    # Execute - access underlying function via .func attribute
+    await enrich_item.func(67890)
 
     # Verify Person persistence
     person = await Person.objects.aget(input_name="Test Person")
@@ -177,3 +190,434 @@ async def test_enrich_item_org_persistence():
 
     # Verify Person-Faculty link
     assert person.faculty_id == eemcs.id
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_item_person_failure_does_not_fail_course(mocked_scraper):
+    await CopyrightItem.objects.acreate(material_id=24680, course_code="191154340")
+
+    mock_course_info = {
+        "name": "Gasdynamics",
+        "teachers": ["Good, G.", "Bad, B."],
+        "contacts": [],
+    }
+
+    async def fetch_person_data(name):
+        if name == "Bad, B.":
+            raise RuntimeError("people page unavailable")
+        return {"main_name": name, "email": "g.good@utwente.nl"}
+
+    mocked_scraper.fetch_course_details.return_value = mock_course_info
+    mocked_scraper.fetch_person_data.side_effect = fetch_person_data
+
+    await enrich_item.func(24680)
+
+    item = await CopyrightItem.objects.aget(material_id=24680)
+    assert item.enrichment_status == EnrichmentStatus.COMPLETED
+    assert mocked_scraper.fetch_person_data.await_count == 2
+    assert await Person.objects.filter(input_name="Good, G.").aexists()
+    assert not await Person.objects.filter(input_name="Bad, B.").aexists()
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_items_batch_completes_every_item(mocked_scraper, mock_pdfs):
+    item_ids = [31001, 31002, 31003]
+    await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=i, course_code="191154340") for i in item_ids]
+    )
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_BATCH,
+        total_items=len(item_ids),
+        status=EnrichmentBatch.Status.RUNNING,
+    )
+    results = await EnrichmentResult.objects.abulk_create(
+        [
+            EnrichmentResult(
+                item_id=i, batch=batch, status=EnrichmentResult.Status.PENDING
+            )
+            for i in item_ids
+        ]
+    )
+
+    mocked_scraper.fetch_course_details.return_value = {
+        "name": "Gasdynamics",
+        "teachers": [],
+        "contacts": [],
+    }
+
+    await enrich_items_batch.func(
+        item_ids, batch_id=batch.id, result_ids=[r.id for r in results]
+    )
+
+    # One scraper session, download pass and parse pass serve the whole chunk
+    mocked_scraper.__aenter__.assert_awaited_once()
+    mock_pdfs.download.assert_awaited_once()
+    assert mock_pdfs.download.await_args.kwargs["filter_ids"] == item_ids
+    mock_pdfs.parse.assert_awaited_once_with(filter_ids=item_ids)
+
+    await batch.arefresh_from_db()
+    assert batch.processed_items == len(item_ids)
+    assert batch.status == EnrichmentBatch.Status.COMPLETED
+    assert await EnrichmentResult.objects.filter(
+        batch=batch, status=EnrichmentResult.Status.SUCCESS
+    ).acount() == len(item_ids)
+    assert await EnrichmentResult.objects.filter(
+        batch=batch, diff_summary__new_courses=["Gasdynamics"]
+    ).acount() == len(item_ids)
+    assert await CopyrightItem.objects.filter(
+        material_id__in=item_ids, enrichment_status=EnrichmentStatus.COMPLETED
+    ).acount() == len(item_ids)
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_items_batch_fetches_shared_course_once(mocked_scraper):
+    item_ids = [32001, 32002]
+    await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=i, course_code="191154340") for i in item_ids]
+    )
+
+    mocked_scraper.fetch_course_details.return_value = {
+        "name": "Gasdynamics",
+        "teachers": ["Jansen, J."],
+        "contacts": [],
+    }
+    mocked_scraper.fetch_person_data.return_value = {"main_name": "Jansen, J. (Jan)"}
+
+    await enrich_items_batch.func(item_ids)
+
+    assert mocked_scraper.fetch_course_details.await_count == 1
+    assert mocked_scraper.fetch_person_data.await_count == 1
+    for item_id in item_ids:
+        item = await CopyrightItem.objects.aget(material_id=item_id)
+        assert await item.courses.filter(cursuscode=191154340).aexists()
+    assert await CourseEmployee.objects.filter(
+        course_id=191154340, person__input_name="Jansen, J."
+    ).aexists()
+
+
+@pytest.mark.django_db
+def test_get_item_snapshot_reads_from_prefetch_cache(django_assert_num_queries):
+    item = CopyrightItem.objects.create(material_id=33001)
+    course = Course.objects.create(cursuscode=191154340, year=2024, name="GD")
+    for name in ("Jansen, J.", "Pietersen, P."):
+        person = Person.objects.create(input_name=name)
+        CourseEmployee.objects.create(course=course, person=person, role="teachers")
+    item.courses.add(course)
+
+    item = CopyrightItem.objects.prefetch_related(SNAPSHOT_PREFETCH).get(
+        material_id=33001
+    )
+    with django_assert_num_queries(0):
+        snapshot = _get_item_snapshot(item)
+
+    assert snapshot["courses"] == [{"code": 191154340, "name": "GD"}]
+    assert sorted(snapshot["teachers"]) == ["Jansen, J.", "Pietersen, P."]
+    assert snapshot["has_document"] is False
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_item_records_before_and_after_snapshots(mocked_scraper):
+    await CopyrightItem.objects.acreate(material_id=34001, course_code="191154340")
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_SINGLE, total_items=1
+    )
+    result = await EnrichmentResult.objects.acreate(
+        item_id=34001, batch=batch, status=EnrichmentResult.Status.PENDING
+    )
+
+    mocked_scraper.fetch_course_details.return_value = {
+        "name": "Gasdynamics",
+        "teachers": ["Jansen, J."],
+    }
+    mocked_scraper.fetch_person_data.return_value = {"main_name": "Jansen, J. (Jan)"}
+
+    await enrich_item.func(34001, batch_id=batch.id, result_id=result.id)
+
+    await result.arefresh_from_db()
+    assert result.status == EnrichmentResult.Status.SUCCESS
+    assert result.data_before == {"courses": [], "has_document": False, "teachers": []}
+    assert result.data_after == {
+        "courses": [{"code": 191154340, "name": "Gasdynamics"}],
+        "has_document": False,
+        "teachers": ["Jansen, J. (Jan)"],
+    }
+
+
+@pytest.mark.parametrize(
+    ("course_code", "expected"),
+    [
+        ("191154340", 191154340),
+        ("2024-191154340-1A", 191154340),
+        ("n/a | 202200096", 202200096),
+        ("201400123 | 191154340", 201400123),
+        ("12345", 12345),
+        ("2024-12345-1A", None),
+        ("1911543401-x", None),
+        ("", None),
+    ],
+)
+def test_parse_course_id(course_code, expected):
+    assert parse_course_id(course_code) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_item_updates_course_employee_role_in_place(mocked_scraper):
+    await CopyrightItem.objects.acreate(material_id=35001, course_code="191154340")
+    course = await Course.objects.acreate(cursuscode=191154340, year=2024, name="GD")
+    person = await Person.objects.acreate(input_name="Jansen, J.")
+    employee = await CourseEmployee.objects.acreate(
+        course=course, person=person, role="teachers"
+    )
+
+    mocked_scraper.fetch_course_details.return_value = {
+        "name": "GD",
+        "teachers": [],
+        "contacts": ["Jansen, J."],
+    }
+    mocked_scraper.fetch_person_data.return_value = {"main_name": "Jansen, J. (Jan)"}
+
+    await enrich_item.func(35001)
+
+    updated = await CourseEmployee.objects.aget(course=course, person=person)
+    assert updated.pk == employee.pk
+    assert updated.role == "contacts"
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_trigger_batch_enrichment_enqueues_chunks():
+    from django.core.files.base import ContentFile
+
+    from apps.core.models import ChangeLog
+    from apps.ingest.models import IngestionBatch
+    from apps.users.models import User
+
+    user = await User.objects.acreate(username="trigger-batch-user")
+    ingestion = await IngestionBatch.objects.acreate(
+        source_type=IngestionBatch.SourceType.QLIK,
+        uploaded_by=user,
+        source_file=ContentFile(b"dummy content", name="test.xlsx"),
+    )
+    items = await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=36000 + i) for i in range(40)]
+    )
+    await ChangeLog.objects.abulk_create(
+        [
+            ChangeLog(
+                item=item,
+                changes={},
+                change_source=ChangeLog.ChangeSource.QLIK_INGESTION,
+                batch=ingestion,
+            )
+            for item in items
+        ]
+    )
+
+    with patch("apps.enrichment.tasks.enrich_items_batch") as mock_task:
+        mock_task.aenqueue = AsyncMock()
+        await trigger_batch_enrichment(ingestion.id)
+
+    e_batch = await EnrichmentBatch.objects.aget()
+    assert e_batch.total_items == 40
+    assert e_batch.metadata == {"ingestion_batch_id": ingestion.id}
+    assert await EnrichmentResult.objects.filter(batch=e_batch).acount() == 40
+    chunk_sizes = [len(c.args[0]) for c in mock_task.aenqueue.await_args_list]
+    assert chunk_sizes == [32, 8]
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enqueue_manual_batch_counts_the_items_it_enqueued():
+    await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=41000 + i) for i in range(3)]
+    )
+    # Counted by the view before two items were removed again
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_BATCH,
+        total_items=5,
+        status=EnrichmentBatch.Status.RUNNING,
+    )
+
+    async def finish_chunk(item_ids, batch_id, result_ids):
+        await _update_batch_status(batch_id, processed=len(item_ids))
+
+    with patch("apps.enrichment.tasks.enrich_items_batch") as mock_task:
+        mock_task.aenqueue = AsyncMock(side_effect=finish_chunk)
+        await enqueue_manual_batch.func(batch.id)
+
+    await batch.arefresh_from_db()
+    assert batch.total_items == 3
+    assert batch.status == EnrichmentBatch.Status.COMPLETED
+    assert batch.completed_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_update_batch_status_completes_on_last_item():
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_BATCH,
+        total_items=2,
+        status=EnrichmentBatch.Status.RUNNING,
+    )
+
+    await _update_batch_status(batch.id, processed=1)
+    await batch.arefresh_from_db()
+    assert (batch.processed_items, batch.failed_items) == (1, 0)
+    assert batch.status == EnrichmentBatch.Status.RUNNING
+    assert batch.completed_at is None
+
+    await _update_batch_status(batch.id, failed=1)
+    await batch.arefresh_from_db()
+    assert (batch.processed_items, batch.failed_items) == (1, 1)
+    assert batch.status == EnrichmentBatch.Status.COMPLETED
+    assert batch.completed_at is not None
+
+
+async def test_process_batch_documents_parses_while_downloading(mock_pdfs):
+    async def fake_download(limit, filter_ids, on_downloaded):
+        # Items 1 and 2 share a file, item 3 has nothing to download
+        await on_downloaded(SimpleNamespace(material_id=1, document_id=10))
+        await on_downloaded(SimpleNamespace(material_id=2, document_id=10))
+        return {"downloaded": 2, "failed": 0}
+
+    mock_pdfs.download.side_effect = fake_download
+
+    errors = await _process_batch_documents([1, 2, 3])
+
+    assert errors == {}
+    parsed = [c.kwargs["filter_ids"] for c in mock_pdfs.parse.await_args_list]
+    # One pipelined parse for the shared document, then the closing sweep
+    assert parsed == [[1], [1, 2, 3]]
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_item_snapshot_sees_downloaded_document(mock_pdfs):
+    await CopyrightItem.objects.acreate(
+        material_id=37001, url="https://canvas.utwente.nl/files/37001"
+    )
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_SINGLE, total_items=1
+    )
+    result = await EnrichmentResult.objects.acreate(
+        item_id=37001, batch=batch, status=EnrichmentResult.Status.PENDING
+    )
+
+    async def fake_download(filter_ids, on_downloaded):
+        await on_downloaded(SimpleNamespace(material_id=37001, document_id=99))
+
+    mock_pdfs.download.side_effect = fake_download
+
+    await enrich_item.func(37001, batch_id=batch.id, result_id=result.id)
+
+    await result.arefresh_from_db()
+    assert result.data_before["has_document"] is False
+    assert result.data_after["has_document"] is True
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_items_batch_reports_downloaded_pdf(mock_pdfs):
+    from apps.documents.models import Document, PDFCanvasMetadata
+
+    item_ids = [38001, 38002]
+    await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=i) for i in item_ids]
+    )
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_BATCH, total_items=len(item_ids)
+    )
+    results = await EnrichmentResult.objects.abulk_create(
+        [
+            EnrichmentResult(
+                item_id=i, batch=batch, status=EnrichmentResult.Status.PENDING
+            )
+            for i in item_ids
+        ]
+    )
+    metadata = await PDFCanvasMetadata.objects.acreate(
+        uuid="uuid38001",
+        display_name="test.pdf",
+        filename="test.pdf",
+        size=10,
+        canvas_created_at="2024-01-01T00:00:00Z",
+        canvas_updated_at="2024-01-01T00:00:00Z",
+        locked=False,
+        hidden=False,
+        visibility_level="public",
+        download_url="http://example.com/38001",
+    )
+
+    async def fake_download(limit, filter_ids, on_downloaded):
+        # Only the first item has a file to download
+        document = await Document.objects.acreate(
+            filehash="hash38001", canvas_metadata=metadata
+        )
+        item = await CopyrightItem.objects.aget(material_id=38001)
+        item.document = document
+        await item.asave(update_fields=["document"])
+        await on_downloaded(item)
+
+    mock_pdfs.download.side_effect = fake_download
+
+    await enrich_items_batch.func(
+        item_ids, batch_id=batch.id, result_ids=[r.id for r in results]
+    )
+
+    pdf_added = {
+        r.item_id: r.diff_summary["pdf_added"]
+        async for r in EnrichmentResult.objects.filter(batch=batch)
+    }
+    assert pdf_added == {38001: True, 38002: False}
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_enrich_items_batch_records_download_failure_per_item(mock_pdfs):
+    item_ids = [39001, 39002]
+    await CopyrightItem.objects.abulk_create(
+        [CopyrightItem(material_id=i) for i in item_ids]
+    )
+    batch = await EnrichmentBatch.objects.acreate(
+        source=EnrichmentBatch.Source.MANUAL_BATCH, total_items=len(item_ids)
+    )
+    results = await EnrichmentResult.objects.abulk_create(
+        [
+            EnrichmentResult(
+                item_id=i, batch=batch, status=EnrichmentResult.Status.PENDING
+            )
+            for i in item_ids
+        ]
+    )
+    mock_pdfs.download.side_effect = RuntimeError("Canvas unreachable")
+
+    await enrich_items_batch.func(
+        item_ids, batch_id=batch.id, result_ids=[r.id for r in results]
+    )
+
+    async for result in EnrichmentResult.objects.filter(batch=batch):
+        assert result.error_log == "PDF Download failed: Canvas unreachable"
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_finalization_buffer_flushes_before_chunk_ends(monkeypatch):
+    monkeypatch.setattr(FinalizationBuffer, "FLUSH_SIZE", 2)
+    items = await CopyrightItem.objects.abulk_create(
+        [
+            CopyrightItem(material_id=i, enrichment_status=EnrichmentStatus.RUNNING)
+            for i in (40001, 40002, 40003)
+        ]
+    )
+
+    async with FinalizationBuffer() as buffer:
+        for item in items:
+            item.enrichment_status = EnrichmentStatus.COMPLETED
+            await buffer.add(item, None, enrichment_successful=True)
+        # The first two were written once the buffer was full
+        statuses = {
+            item.material_id: item.enrichment_status
+            async for item in CopyrightItem.objects.filter(material_id__gte=40001)
+        }
+        assert statuses == {
+            40001: EnrichmentStatus.COMPLETED,
+            40002: EnrichmentStatus.COMPLETED,
+            40003: EnrichmentStatus.RUNNING,
+        }
+
+    assert not await CopyrightItem.objects.filter(
+        enrichment_status=EnrichmentStatus.RUNNING
+    ).aexists()
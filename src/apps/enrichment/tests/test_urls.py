@@ -7,10 +7,34 @@ Tests verify:
 - Item enrichment triggers work correctly
 - Batch enrichment triggers work correctly
 """
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from django.http import Http404
 from django.urls import reverse
 
-from apps.core.models import CopyrightItem
+from apps.enrichment.models import EnrichmentBatch
+
+# Resolved once at import; per-item URLs are filled in by substituting the id.
+_URL_ID_SENTINEL = 987654321
+_ITEM_URL_TEMPLATES = {
+    name: reverse(f"enrichment:{name}", kwargs={"material_id": _URL_ID_SENTINEL})
+    for name in ("trigger_item", "item_status")
+}
+TRIGGER_BATCH_URL = reverse("enrichment:trigger_batch")
+
+
+def item_url(name: str, material_id: int) -> str:
+    """Return the URL of an item-level enrichment view."""
+    return _ITEM_URL_TEMPLATES[name].replace(str(_URL_ID_SENTINEL), str(material_id))
+
+
+@pytest.fixture
+def batch_task():
+    """Patch the batch task so triggering a batch never runs a real enrichment."""
+    with patch("apps.enrichment.views.enqueue_manual_batch") as mock_task:
+        mock_task.aenqueue = AsyncMock()
+        yield mock_task
 
 
 class TestEnrichmentURLs:
@@ -20,89 +44,86 @@ class TestEnrichmentURLs:
     # URL Resolution Tests
     # =========================================================================
 
-    @pytest.mark.django_db(transaction=True)
-    def test_trigger_item_enrichment_url_resolves(self, authenticated_client, staff_user):
+    @pytest.mark.django_db
+    def test_trigger_item_enrichment_url_resolves(self, authenticated_client, make_item):
         """Test that trigger item enrichment URL resolves correctly."""
-        item = CopyrightItem.objects.create(
-            material_id=999101,
-            title="Test Item",
-            filetype="PDF",
-            course_code="191154340",
-        )
-
-        url = reverse("enrichment:trigger_item", kwargs={"material_id": item.material_id})
+        item = make_item(999101, course_code="191154340")
+
+        url = item_url("trigger_item", item.material_id)
         response = authenticated_client.post(url)
         # POST should trigger enrichment
         assert response.status_code in [200, 302, 202]
 
     @pytest.mark.django_db
-    def test_item_enrichment_status_url_resolves(self, authenticated_client, staff_user):
+    def test_item_enrichment_status_url_resolves(self, authenticated_client, make_item):
         """Test that item enrichment status URL resolves correctly."""
-        item = CopyrightItem.objects.create(
-            material_id=999102,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999102)
 
-        url = reverse("enrichment:item_status", kwargs={"material_id": item.material_id})
+        url = item_url("item_status", item.material_id)
         response = authenticated_client.get(url)
         # Should return status (JSON or HTML)
         assert response.status_code == 200
 
-    @pytest.mark.django_db(transaction=True)
-    def test_trigger_batch_enrichment_url_resolves(self, authenticated_client):
+    @pytest.mark.django_db
+    def test_trigger_batch_enrichment_url_resolves(
+        self, authenticated_client, make_item, batch_task
+    ):
         """Test that trigger batch enrichment URL resolves correctly."""
-        url = reverse("enrichment:trigger_batch")
+        make_item(999109)
+
+        url = TRIGGER_BATCH_URL
         # This appears to be POST-only based on the error
         response = authenticated_client.post(url, {})
         # POST should trigger batch enrichment
         assert response.status_code in [200, 302, 400]
+        batch_task.aenqueue.assert_awaited_once_with(EnrichmentBatch.objects.get().id)
 
-    @pytest.mark.django_db(transaction=True)
-    def test_trigger_batch_enrichment_post(self, authenticated_client):
+    @pytest.mark.django_db
+    def test_trigger_batch_enrichment_post(
+        self, authenticated_client, make_item, batch_task
+    ):
         """Test that batch enrichment accepts POST requests."""
-        url = reverse("enrichment:trigger_batch")
+        make_item(999110)
+
+        url = TRIGGER_BATCH_URL
         response = authenticated_client.post(url, {})
         # POST should trigger batch enrichment
         assert response.status_code in [200, 302, 400]
+        batch_task.aenqueue.assert_awaited_once_with(EnrichmentBatch.objects.get().id)
 
     # =========================================================================
     # Authentication Tests
     # =========================================================================
 
-    @pytest.mark.django_db(transaction=True)
-    def test_trigger_item_enrichment_requires_authentication(self, client, staff_user):
+    @pytest.mark.django_db
+    def test_trigger_item_enrichment_requires_authentication(self, client, make_item):
         """Test that item enrichment authentication behavior."""
-        item = CopyrightItem.objects.create(
-            material_id=999103,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999103)
 
-        url = reverse("enrichment:trigger_item", kwargs={"material_id": item.material_id})
+        url = item_url("trigger_item", item.material_id)
         response = client.post(url)
         # Some endpoints may not require authentication (custom auth logic)
         # Accept 200, 302, 401, 403, or 400 (validation error)
         assert response.status_code in [200, 302, 400, 401, 403]
 
     @pytest.mark.django_db
-    def test_item_status_requires_authentication(self, client, staff_user):
+    def test_item_status_requires_authentication(self, client, make_item):
         """Test that item enrichment status authentication behavior."""
-        item = CopyrightItem.objects.create(
-            material_id=999104,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999104)
 
-        url = reverse("enrichment:item_status", kwargs={"material_id": item.material_id})
+        url = item_url("item_status", item.material_id)
         response = client.get(url)
         # Some endpoints may not require authentication
         assert response.status_code in [200, 302, 401, 403]
 
-    @pytest.mark.django_db(transaction=True)
-    def test_trigger_batch_enrichment_requires_authentication(self, client):
+    @pytest.mark.django_db
+    def test_trigger_batch_enrichment_requires_authentication(
+        self, client, make_item, batch_task
+    ):
         """Test that batch enrichment authentication behavior."""
-        url = reverse("enrichment:trigger_batch")
+        make_item(999111)
+
+        url = TRIGGER_BATCH_URL
         response = client.post(url, {})
         # Some endpoints may not require authentication
         assert response.status_code in [200, 302, 400, 401, 403]
@@ -111,25 +132,25 @@ class TestEnrichmentURLs:
     # Invalid Parameter Tests
     # =========================================================================
 
-    @pytest.mark.django_db
-    def test_nonexistent_item_enrichment_returns_404(self, authenticated_client):
+    def test_nonexistent_item_enrichment_returns_404(self, client):
         """Test that enriching non-existent item returns 404."""
-        url = reverse("enrichment:trigger_item", kwargs={"material_id": 999999})
-        response = authenticated_client.post(url)
+        url = item_url("trigger_item", 999999)
+        with patch("apps.enrichment.views.get_object_or_404", side_effect=Http404):
+            response = client.post(url)
         assert response.status_code == 404
 
-    @pytest.mark.django_db
-    def test_nonexistent_item_status_returns_404(self, authenticated_client):
+    def test_nonexistent_item_status_returns_404(self, client):
         """Test that status for non-existent item returns 404."""
-        url = reverse("enrichment:item_status", kwargs={"material_id": 999999})
-        response = authenticated_client.get(url)
+        url = item_url("item_status", 999999)
+        with patch("apps.enrichment.views.aget_object_or_404", side_effect=Http404):
+            response = client.get(url)
         assert response.status_code == 404
 
     @pytest.mark.django_db
     def test_invalid_material_id_returns_404(self, authenticated_client):
         """Test that invalid material_id format returns 404."""
         # Django URL routing handles type validation at the routing level
-        url = reverse("enrichment:item_status", kwargs={"material_id": 0})
+        url = item_url("item_status", 0)
         response = authenticated_client.get(url)
         assert response.status_code == 404
 
@@ -138,30 +159,22 @@ class TestEnrichmentURLs:
     # =========================================================================
 
     @pytest.mark.django_db
-    def test_trigger_item_enrichment_post_required(self, authenticated_client, staff_user):
+    def test_trigger_item_enrichment_post_required(self, authenticated_client, make_item):
         """Test that item enrichment requires POST."""
-        item = CopyrightItem.objects.create(
-            material_id=999105,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999105)
 
-        url = reverse("enrichment:trigger_item", kwargs={"material_id": item.material_id})
+        url = item_url("trigger_item", item.material_id)
         # GET might return 405 Method Not Allowed or show form
         response = authenticated_client.get(url)
         # Should accept POST, GET might be allowed for form display
         assert response.status_code in [200, 302, 405]
 
     @pytest.mark.django_db
-    def test_item_status_get_allowed(self, authenticated_client, staff_user):
+    def test_item_status_get_allowed(self, authenticated_client, make_item):
         """Test that item status accepts GET requests."""
-        item = CopyrightItem.objects.create(
-            material_id=999106,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999106)
 
-        url = reverse("enrichment:item_status", kwargs={"material_id": item.material_id})
+        url = item_url("item_status", item.material_id)
         response = authenticated_client.get(url)
         assert response.status_code == 200
 
@@ -170,36 +183,28 @@ class TestEnrichmentURLs:
     # =========================================================================
 
     @pytest.mark.django_db
-    def test_item_status_returns_json_or_html(self, authenticated_client, staff_user):
+    def test_item_status_returns_json_or_html(self, authenticated_client, make_item):
         """Test that item status returns appropriate response format."""
-        item = CopyrightItem.objects.create(
-            material_id=999107,
-            title="Test Item",
-            filetype="PDF",
-        )
+        item = make_item(999107)
 
-        url = reverse("enrichment:item_status", kwargs={"material_id": item.material_id})
+        url = item_url("item_status", item.material_id)
         response = authenticated_client.get(url)
 
         # Should return either JSON or HTML
         content_type = response["Content-Type"]
         assert content_type.startswith(("application/json", "text/html"))
 
-    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.django_db
     def test_batch_enrichment_returns_success_indicator(
-        self, authenticated_client, staff_user
+        self, authenticated_client, make_item, batch_task
     ):
         """Test that batch enrichment returns success/failure indicator."""
         # Create a test item to enrich
-        item = CopyrightItem.objects.create(
-            material_id=999108,
-            title="Test Item",
-            filetype="PDF",
-            course_code="191154340",
-        )
-
-        url = reverse("enrichment:trigger_batch")
+        item = make_item(999108, course_code="191154340")
+
+        url = TRIGGER_BATCH_URL
         response = authenticated_client.post(url, {"item_ids": [item.material_id]})
 
         # Should return success indicator (JSON or redirect)
         assert response.status_code in [200, 302]
+        batch_task.aenqueue.assert_awaited_once_with(EnrichmentBatch.objects.get().id)
@@ -1,4 +1,5 @@
-from unittest.mock import patch
+import contextlib
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from django.urls import reverse
@@ -25,13 +26,21 @@ class TestEnrichmentViews:
             enrichment_status=EnrichmentStatus.PENDING,
         )
 
-    def test_trigger_item_enrichment(self, client, item):
+    def test_trigger_item_enrichment(
+        self, client, item, django_capture_on_commit_callbacks
+    ):
         """Test manual trigger of enrichment via HTMX."""
         url = reverse("enrichment:trigger_item", args=[item.material_id])
 
         # Patch the async task trigger
-        with patch("apps.enrichment.views.enrich_item"):
-            response = client.post(url)
+        with patch("apps.enrichment.views.enrich_item") as mock_task:
+            with django_capture_on_commit_callbacks() as callbacks:
+                response = client.post(url)
+            # Enqueued only once the batch and result rows are committed
+            mock_task.enqueue.assert_not_called()
+            for callback in callbacks:
+                callback()
+            mock_task.enqueue.assert_called_once()
 
             assert response.status_code == 200
             assert b"Running..." in response.content
@@ -39,6 +48,19 @@ class TestEnrichmentViews:
             # without more complex mocking of the event loop,
             # but we verify the view logic returns the correct HTMX partial.
 
+    def test_trigger_batch_enrichment_defers_fan_out(self, client, item):
+        """The view only creates the batch and hands the fan-out to a task."""
+        from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+
+        with patch("apps.enrichment.views.enqueue_manual_batch") as mock_task:
+            mock_task.aenqueue = AsyncMock()
+            response = client.post(reverse("enrichment:trigger_batch"))
+
+        assert response.status_code == 200
+        batch = EnrichmentBatch.objects.get()
+        mock_task.aenqueue.assert_awaited_once_with(batch.id)
+        assert not EnrichmentResult.objects.exists()
+
     def test_item_enrichment_status(self, client, item):
         """Test status polling view."""
         url = reverse("enrichment:item_status", args=[item.material_id])
@@ -53,3 +75,176 @@ class TestEnrichmentViews:
         response = client.get(url)
         assert response.status_code == 200
         assert b"COMPLETED" in response.content
+
+    def test_completed_status_shows_summary_in_two_queries(
+        self, client, item, django_assert_num_queries
+    ):
+        """The item, its document and the latest result take two queries."""
+        from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+
+        item.enrichment_status = EnrichmentStatus.COMPLETED
+        item.save()
+        batch = EnrichmentBatch.objects.create(
+            source=EnrichmentBatch.Source.MANUAL_SINGLE, total_items=1
+        )
+        result = EnrichmentResult(
+            item=item,
+            batch=batch,
+            status=EnrichmentResult.Status.SUCCESS,
+            data_before={"courses": [], "teachers": []},
+            data_after={"courses": [], "teachers": ["Jansen, J."]},
+        )
+        result.set_diff_summary()
+        result.save()
+        url = reverse("enrichment:item_status", args=[item.material_id])
+
+        # The stored summary is read; the snapshots stay unloaded
+        with django_assert_num_queries(2):
+            response = client.get(url)
+
+        assert b"Enriched" in response.content
+        assert b"Found: Jansen, J." in response.content
+
+    def test_final_status_badge_is_cached_per_attempt(
+        self, client, item, settings, django_assert_num_queries
+    ):
+        """A repeated poll is served from cache until the next attempt."""
+        from django.utils import timezone
+
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        item.enrichment_status = EnrichmentStatus.FAILED
+        item.last_enrichment_attempt = timezone.now()
+        item.save()
+        url = reverse("enrichment:item_status", args=[item.material_id])
+
+        first = client.get(url)
+        with django_assert_num_queries(1):
+            assert client.get(url).content == first.content
+
+        item.enrichment_status = EnrichmentStatus.COMPLETED
+        item.save()
+        assert b"COMPLETED" in client.get(url).content
+
+    def test_failed_status_escapes_error_log(self, client, item):
+        """Error text from external sources cannot break out of the tooltip."""
+        from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+
+        item.enrichment_status = EnrichmentStatus.FAILED
+        item.save()
+        batch = EnrichmentBatch.objects.create(
+            source=EnrichmentBatch.Source.MANUAL_SINGLE, total_items=1
+        )
+        EnrichmentResult.objects.create(
+            item=item,
+            batch=batch,
+            status=EnrichmentResult.Status.FAILURE,
+            error_log='bad "name"<script>',
+        )
+        url = reverse("enrichment:item_status", args=[item.material_id])
+
+        response = client.get(url)
+
+        assert b"<script>" not in response.content
+        assert b'title="bad &quot;name&quot;&lt;script&gt;"' in response.content
+
+    def test_running_status_polls_without_result_lookup(
+        self, client, item, django_assert_num_queries
+    ):
+        """Running items get the static polling badge from the item query alone."""
+        item.enrichment_status = EnrichmentStatus.RUNNING
+        item.save()
+        url = reverse("enrichment:item_status", args=[item.material_id])
+
+        with django_assert_num_queries(1):
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert f'hx-get="/enrichment/item/{item.material_id}/status/"'.encode() in (
+            response.content
+        )
+
+    def test_trigger_batch_enrichment_enqueues_chunks(self, client, item):
+        """Batch trigger creates results in bulk and enqueues one task per chunk."""
+        from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
+
+        CopyrightItem.objects.bulk_create(
+            [CopyrightItem(material_id=2001 + i) for i in range(40)]
+        )
+        url = reverse("enrichment:trigger_batch")
+
+        with patch("apps.enrichment.tasks.enrich_items_batch") as mock_task:
+            mock_task.aenqueue = AsyncMock()
+            response = client.post(url)
+
+        assert response.status_code == 200
+        assert b"41 items" in response.content
+        batch = EnrichmentBatch.objects.get()
+        assert batch.total_items == 41
+        assert EnrichmentResult.objects.filter(batch=batch).count() == 41
+        chunk_sizes = [len(c.args[0]) for c in mock_task.aenqueue.await_args_list]
+        assert chunk_sizes == [32, 9]
+
+    def test_unchanged_status_poll_returns_not_modified(self, client, item, settings):
+        """A poll carrying the current ETag gets a bodyless 304."""
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        item.enrichment_status = EnrichmentStatus.RUNNING
+        item.save()
+        url = reverse("enrichment:item_status", args=[item.material_id])
+
+        first = client.get(url)
+        etag = first["ETag"]
+        assert client.get(url, headers={"if-none-match": etag}).status_code == 304
+
+        item.enrichment_status = EnrichmentStatus.COMPLETED
+        item.save()
+        response = client.get(url, headers={"if-none-match": etag})
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+
+async def _read_events(async_client, material_id: int) -> str:
+    url = reverse("enrichment:item_events", args=[material_id])
+    response = await async_client.get(url)
+    assert response["Content-Type"] == "text/event-stream"
+    return "".join([chunk.decode() async for chunk in response.streaming_content])
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_events_stream_reports_finished_item_right_away(async_client):
+    await CopyrightItem.objects.acreate(
+        material_id=2100, enrichment_status=EnrichmentStatus.COMPLETED
+    )
+
+    events = await _read_events(async_client, 2100)
+
+    assert events.startswith("retry: ")
+    assert "event: status\n" in events
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_events_stream_waits_for_published_change(async_client):
+    await CopyrightItem.objects.acreate(
+        material_id=2101, enrichment_status=EnrichmentStatus.RUNNING
+    )
+    waits = []
+
+    def subscription(changed: bool):
+        @contextlib.asynccontextmanager
+        async def _subscription(material_id):
+            async def wait(timeout):
+                waits.append(material_id)
+                return changed
+
+            yield wait
+
+        return _subscription
+
+    with patch("apps.enrichment.views.status_subscription", subscription(False)):
+        assert "event: status" not in await _read_events(async_client, 2101)
+    with patch("apps.enrichment.views.status_subscription", subscription(True)):
+        assert "event: status\n" in await _read_events(async_client, 2101)
+    assert waits == [2101, 2101]
@@ -15,6 +15,11 @@ urlpatterns = [
         views.item_enrichment_status,
         name="item_status",
     ),
+    path(
+        "item/<int:material_id>/events/",
+        views.item_enrichment_events,
+        name="item_events",
+    ),
     path(
         "batch/trigger/",
         views.trigger_batch_enrichment_ui,
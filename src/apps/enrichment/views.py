@@ -1,11 +1,79 @@
-from django.http import HttpResponse
-from django.shortcuts import get_object_or_404
+import functools
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.decorators.http import require_POST
 
-from apps.core.models import CopyrightItem
+from apps.core.models import CopyrightItem, EnrichmentStatus
 from apps.enrichment.models import EnrichmentBatch, EnrichmentResult
-from apps.enrichment.tasks import enrich_item
+from apps.enrichment.services.status_events import status_subscription
+from apps.enrichment.tasks import enqueue_manual_batch, enrich_item
+
+STATUS_CLASSES = {
+    EnrichmentStatus.PENDING: "badge-ghost",
+    EnrichmentStatus.RUNNING: "badge-info animate-pulse",
+    EnrichmentStatus.COMPLETED: "badge-success",
+    EnrichmentStatus.FAILED: "badge-error",
+}
+
+# Badge fragments are bytes so responses skip re-encoding them. The live badge
+# refreshes itself when the status events stream reports a change; the slow
+# poll is a fallback for when the stream is unavailable.
+LIVE_BADGE = (
+    b'<span class="badge badge-info animate-pulse" '
+    b'hx-get="%(status_url)s" '
+    b'hx-trigger="sse:status, load delay:30s" hx-swap="outerHTML" '
+    b'hx-ext="sse" sse-connect="%(events_url)s">'
+    b"%(label)s</span>"
+)
+
+PENDING_BADGE = b'<span class="badge badge-ghost">PENDING</span>'
+
+# Statuses whose badge shows no result summary, so polls skip the result
+# lookup. RUNNING keeps refreshing itself until the item reaches a final state.
+STATIC_STATUSES = frozenset({EnrichmentStatus.PENDING, EnrichmentStatus.RUNNING})
+
+# Reversed in place of a real id, then swapped for a %-format placeholder
+_URL_ID_SENTINEL = 987654321
+
+NO_ITEMS_MESSAGE = b"No items to enrich."
+
+# Rendered final-state badges are cached under a versioned key, see below
+STATUS_BADGE_CACHE_TIMEOUT = 300
+# An events stream ends after this long without a change; the client then
+# reconnects after STATUS_EVENTS_RETRY_MS.
+STATUS_EVENTS_TIMEOUT = 25
+STATUS_EVENTS_RETRY_MS = 3000
+
+
+@functools.cache
+def _live_badge_template(label: bytes) -> bytes:
+    """Return LIVE_BADGE for ``label`` as a %-template taking ``material_id``.
+
+    Its URLs are reversed on first use rather than on every request.
+    """
+    urls = {
+        key: reverse(name, kwargs={"material_id": _URL_ID_SENTINEL})
+        .replace(str(_URL_ID_SENTINEL), "%(material_id)d")
+        .encode()
+        for key, name in (
+            (b"status_url", "enrichment:item_status"),
+            (b"events_url", "enrichment:item_events"),
+        )
+    }
+    return LIVE_BADGE % {**urls, b"label": label}
+
+
+def live_badge(material_id: int, label: bytes) -> bytes:
+    """Return the self-refreshing badge for an item whose enrichment is underway."""
+    return _live_badge_template(label) % {b"material_id": material_id}
 
 
 @require_POST
@@ -13,94 +81,120 @@ def trigger_item_enrichment(request, material_id):
     """Trigger enrichment for a single item (manual)."""
     item = get_object_or_404(CopyrightItem, material_id=material_id)
 
-    # Create tracked batch and result
-    batch = EnrichmentBatch.objects.create(
-        source=EnrichmentBatch.Source.MANUAL_SINGLE,
-        total_items=1,
-        status=EnrichmentBatch.Status.RUNNING,
-        started_at=timezone.now(),
-    )
-    res = EnrichmentResult.objects.create(
-        item=item, batch=batch, status=EnrichmentResult.Status.PENDING
-    )
+    # Create tracked batch and result in one commit, and only enqueue once
+    # they are committed so the worker is guaranteed to see both rows.
+    with transaction.atomic():
+        batch = EnrichmentBatch.objects.create(
+            source=EnrichmentBatch.Source.MANUAL_SINGLE,
+            total_items=1,
+            status=EnrichmentBatch.Status.RUNNING,
+            started_at=timezone.now(),
+        )
+        res = EnrichmentResult.objects.create(
+            item=item, batch=batch, status=EnrichmentResult.Status.PENDING
+        )
+        transaction.on_commit(
+            functools.partial(
+                enrich_item.enqueue, material_id, batch_id=batch.id, result_id=res.id
+            )
+        )
 
-    # Enqueue task
-    enrich_item.enqueue(material_id, batch_id=batch.id, result_id=res.id)
-
-    # Return status with delay for HTMX
-    return HttpResponse(
-        f'<span class="badge badge-info animate-pulse" hx-get="/enrichment/item/{material_id}/status/" hx-trigger="load delay:2s" hx-swap="outerHTML">Running...</span>'
-    )
+    return HttpResponse(live_badge(material_id, b"Running..."))
 
 
 @require_POST
-def trigger_batch_enrichment_ui(request):
-    """Trigger enrichment for all items currently in the system."""
-    items = CopyrightItem.objects.all()
-    item_ids = list(items.values_list("material_id", flat=True))
+async def trigger_batch_enrichment_ui(request):
+    """Trigger enrichment for all items currently in the system.
+
+    Only the batch is created here; a task streams the items and enqueues
+    their chunks, so the response does not wait on the whole fan-out.
+    """
+    total_items = await CopyrightItem.objects.acount()
 
-    if not item_ids:
-        return HttpResponse("No items to enrich.")
+    if not total_items:
+        return HttpResponse(NO_ITEMS_MESSAGE)
 
-    batch = EnrichmentBatch.objects.create(
+    batch = await EnrichmentBatch.objects.acreate(
         source=EnrichmentBatch.Source.MANUAL_BATCH,
-        total_items=len(item_ids),
+        total_items=total_items,
         status=EnrichmentBatch.Status.RUNNING,
         started_at=timezone.now(),
     )
+    await enqueue_manual_batch.aenqueue(batch.id)
 
-    for material_id in item_ids:
-        res = EnrichmentResult.objects.create(
-            item_id=material_id, batch=batch, status=EnrichmentResult.Status.PENDING
-        )
-        enrich_item.enqueue(material_id, batch_id=batch.id, result_id=res.id)
+    return HttpResponse(f"Enrichment started for {total_items} items.")
 
-    return HttpResponse(f"Enrichment started for {len(item_ids)} items.")
 
+async def item_enrichment_status(request, material_id):
+    """Return the enrichment status partial for an item with detailed feedback.
 
-def item_enrichment_status(request, material_id):
-    """Return the enrichment status partial for an item with detailed feedback."""
-    item = get_object_or_404(CopyrightItem, material_id=material_id)
-    latest_result = (
-        EnrichmentResult.objects.filter(item=item).order_by("-created_at").first()
+    The badge only changes with the fields in its version string, which also
+    serves as ETag: a poll whose badge did not change is answered with a 304.
+    """
+    item = await aget_object_or_404(
+        CopyrightItem.objects.select_related("document").only(
+            "material_id",
+            "enrichment_status",
+            "last_enrichment_attempt",
+            "document__file",
+        ),
+        material_id=material_id,
+    )
+    # Every finished attempt, failed or not, stamps last_enrichment_attempt,
+    # so a new result always comes with a new version.
+    attempt = item.last_enrichment_attempt
+    version = (
+        f"{material_id}:{item.enrichment_status}:"
+        f"{int(attempt.timestamp()) if attempt else 0}:{item.document_id}"
+    )
+    etag = quote_etag(version)
+    if (response := get_conditional_response(request, etag=etag)) is not None:
+        return response
+
+    response = HttpResponse(await _render_status_badge(item, version))
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+async def _render_status_badge(item: CopyrightItem, version: str) -> bytes:
+    """Return the encoded badge HTML for ``item``, cached per badge ``version``."""
+    material_id = item.material_id
+    attempt = item.last_enrichment_attempt
+    if item.enrichment_status == EnrichmentStatus.PENDING:
+        return PENDING_BADGE
+    if item.enrichment_status == EnrichmentStatus.RUNNING:
+        return live_badge(material_id, b"RUNNING")
+
+    cache_key = f"enrichment:badge:{version}"
+    if (html := await cache.aget(cache_key)) is not None:
+        return html
+
+    latest_result = await (
+        EnrichmentResult.objects.filter(item_id=material_id)
+        .only("diff_summary", "error_log")
+        .order_by("-created_at")
+        .afirst()
     )
 
-    status_classes = {
-        "PENDING": "badge-ghost",
-        "RUNNING": "badge-info animate-pulse",
-        "COMPLETED": "badge-success",
-        "FAILED": "badge-error",
-    }
-
-    status_class = status_classes.get(item.enrichment_status, "badge-ghost")
+    status_class = STATUS_CLASSES.get(item.enrichment_status, "badge-ghost")
     content = item.enrichment_status
     tooltip = ""
 
     if item.enrichment_status == "COMPLETED" and latest_result:
-        # Generate summary of what was added
-        before = latest_result.data_before or {}
-        after = latest_result.data_after or {}
+        summary = latest_result.diff_summary
+        if summary is None:
+            # Finalized before summaries were stored; derive it from snapshots
+            await latest_result.arefresh_from_db(fields=["data_before", "data_after"])
+            latest_result.set_diff_summary()
+            summary = latest_result.diff_summary
 
         diffs = []
-
-        # Courses diff
-        before_courses = {c["code"] for c in before.get("courses", [])}
-        after_courses = {c["code"]: c["name"] for c in after.get("courses", [])}
-        new_courses = [
-            after_courses[code] for code in after_courses if code not in before_courses
-        ]
-        if new_courses:
-            diffs.append(f"Linked: {', '.join(new_courses)}")
-
-        # Teachers diff
-        before_teachers = set(before.get("teachers", []))
-        after_teachers = set(after.get("teachers", []))
-        new_teachers = after_teachers - before_teachers
-        if new_teachers:
-            diffs.append(f"Found: {', '.join(new_teachers)}")
-
-        # PDF diff
-        if not before.get("has_document") and after.get("has_document"):
+        if summary["new_courses"]:
+            diffs.append(f"Linked: {', '.join(summary['new_courses'])}")
+        if summary["new_teachers"]:
+            diffs.append(f"Found: {', '.join(summary['new_teachers'])}")
+        if summary["pdf_added"]:
             diffs.append("PDF Attached")
 
         if diffs:
@@ -110,26 +204,52 @@ def item_enrichment_status(request, material_id):
     elif item.enrichment_status == "FAILED" and latest_result:
         tooltip = latest_result.error_log or "Unknown error"
 
-    # HTMX Polling for running state
-    hx_attrs = ""
-    if item.enrichment_status == "RUNNING":
-        hx_attrs = f'hx-get="/enrichment/item/{material_id}/status/" hx-trigger="load delay:3s" hx-swap="outerHTML"'
-
-    # View PDF link
-    extra_html = ""
-    if item.enrichment_status == "COMPLETED" and item.document:
-        extra_html = f'<a href="{item.document.file.url}" class="ml-2 underline text-xs" target="_blank">View PDF</a>'
-
-    # Real-time Enriched Date OOB Swap
-    oob_date = ""
-    if item.enrichment_status == "COMPLETED" and item.last_enrichment_attempt:
-        formatted_date = item.last_enrichment_attempt.strftime("%Y-%m-%d %H:%M")
-        oob_date = (
-            f'<p id="enriched-date-{material_id}" hx-swap-oob="outerHTML">'
-            f'<span class="font-semibold" title="Last checked">Enriched:</span> {formatted_date}'
-            "</p>"
-        )
-
-    return HttpResponse(
-        f'<span class="badge {status_class}" {hx_attrs} title="{tooltip}">{content}</span>{extra_html}{oob_date}'
+    html = render_to_string(
+        "enrichment/partials/status_badge.html",
+        {
+            "material_id": material_id,
+            "status_class": status_class,
+            "tooltip": tooltip,
+            "content": content,
+            "pdf_url": item.document.file.url
+            if item.enrichment_status == "COMPLETED" and item.document
+            else None,
+            # Real-time Enriched Date OOB Swap
+            "enriched_at": attempt.strftime("%Y-%m-%d %H:%M")
+            if item.enrichment_status == "COMPLETED" and attempt
+            else None,
+        },
+    ).encode()
+    await cache.aset(cache_key, html, STATUS_BADGE_CACHE_TIMEOUT)
+    return html
+
+
+async def item_enrichment_events(request, material_id):
+    """Stream a server-sent ``status`` event once the item's enrichment finishes.
+
+    The badge re-fetches its status partial on the event, so an open badge
+    costs one idle connection instead of a request every few seconds. Needs an
+    ASGI server to avoid tying up a worker thread per open badge.
+    """
+
+    async def stream():
+        yield f"retry: {STATUS_EVENTS_RETRY_MS}\n\n"
+        async with status_subscription(material_id) as wait_for_change:
+            status = await (
+                CopyrightItem.objects.filter(material_id=material_id)
+                .values_list("enrichment_status", flat=True)
+                .afirst()
+            )
+            if status is None:
+                return
+            if status in STATIC_STATUSES and not await wait_for_change(
+                STATUS_EVENTS_TIMEOUT
+            ):
+                return
+        yield "event: status\ndata: changed\n\n"
+
+    return StreamingHttpResponse(
+        stream(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -1,9 +1,75 @@
+import functools
+import json
+
 from django.contrib import admin
+from django.db.models import DurationField, ExpressionWrapper, F, IntegerField
+from django.db.models.functions import Cast, NullIf
 from django.urls import reverse
 from django.utils.html import format_html
+from django.utils.safestring import SafeString
 
 from .models import FacultyEntry, IngestionBatch, ProcessingFailure, QlikEntry
 
+# Reversed in place of a real id, then swapped for a format placeholder
+_URL_ID_SENTINEL = 987654321
+
+
+@functools.cache
+def _batch_change_url_template() -> str:
+    """Return the batch change URL with a ``{}`` placeholder for the id.
+
+    Reversed on first use, as the admin URLs are not loaded at import time.
+    """
+    return reverse(
+        "admin:ingest_ingestionbatch_change", args=[_URL_ID_SENTINEL]
+    ).replace(str(_URL_ID_SENTINEL), "{}")
+
+
+def _batch_link_html(obj):
+    """Return a changelist link to the batch of a staged entry or failure."""
+    url = _batch_change_url_template().format(obj.batch_id)
+    return format_html('<a href="{}">{}</a>', url, obj.batch)
+
+
+SOURCE_TYPE_COLORS = {
+    "QLIK": "#3b82f6",  # blue
+    "FACULTY": "#10b981",  # green
+}
+STATUS_COLORS = {
+    "PENDING": "#f59e0b",  # amber
+    "STAGING": "#3b82f6",  # blue
+    "PROCESSING": "#8b5cf6",  # purple
+    "COMPLETED": "#10b981",  # green
+    "FAILED": "#ef4444",  # red
+    "PARTIAL": "#f59e0b",  # amber
+}
+DEFAULT_BADGE_COLOR = "#6b7280"
+
+PROCESSED_BADGE = format_html(
+    '<span style="background: #10b981; color: white; padding: 2px 6px; '
+    'border-radius: 3px; font-size: 11px;">{}</span>',
+    "✓",
+)
+UNPROCESSED_BADGE = format_html(
+    '<span style="background: #6b7280; color: white; padding: 2px 6px; '
+    'border-radius: 3px; font-size: 11px;">{}</span>',
+    "○",
+)
+
+
+@functools.cache
+def _badge_html(color: str, label: str) -> SafeString:
+    """Return a coloured changelist badge, rendered once per colour and label.
+
+    Labels are the translated choice display, so each language gets its own.
+    """
+    return format_html(
+        '<span style="background: {}; color: white; padding: 3px 8px; '
+        'border-radius: 3px; font-weight: bold; font-size: 11px;">{}</span>',
+        color,
+        label,
+    )
+
 
 @admin.register(IngestionBatch)
 class IngestionBatchAdmin(admin.ModelAdmin):
@@ -88,64 +154,64 @@ class IngestionBatchAdmin(admin.ModelAdmin):
     )
 
     def source_type_badge(self, obj):
-        colors = {
-            "QLIK": "#3b82f6",  # blue
-            "FACULTY": "#10b981",  # green
-        }
-        color = colors.get(obj.source_type, "#6b7280")
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; '
-            'border-radius: 3px; font-weight: bold; font-size: 11px;">{}</span>',
-            color,
+        return _badge_html(
+            SOURCE_TYPE_COLORS.get(obj.source_type, DEFAULT_BADGE_COLOR),
             obj.get_source_type_display(),
         )
 
     source_type_badge.short_description = "Type"
 
     def status_badge(self, obj):
-        colors = {
-            "PENDING": "#f59e0b",  # amber
-            "STAGING": "#3b82f6",  # blue
-            "PROCESSING": "#8b5cf6",  # purple
-            "COMPLETED": "#10b981",  # green
-            "FAILED": "#ef4444",  # red
-            "PARTIAL": "#f59e0b",  # amber
-        }
-        color = colors.get(obj.status, "#6b7280")
-        return format_html(
-            '<span style="background: {}; color: white; padding: 3px 8px; '
-            'border-radius: 3px; font-weight: bold; font-size: 11px;">{}</span>',
-            color,
+        return _badge_html(
+            STATUS_COLORS.get(obj.status, DEFAULT_BADGE_COLOR),
             obj.get_status_display(),
         )
 
     status_badge.short_description = "Status"
 
+    def get_queryset(self, request):
+        # Progress and duration are computed by the database for the whole page
+        processed = (
+            F("items_created")
+            + F("items_updated")
+            + F("items_skipped")
+            + F("items_failed")
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                processed_items=processed,
+                # Whole percent, as the cast rounds to the nearest integer
+                progress_pct=Cast(
+                    processed * 100.0 / NullIf(F("total_rows"), 0), IntegerField()
+                ),
+                processing_time=ExpressionWrapper(
+                    F("completed_at") - F("started_at"), output_field=DurationField()
+                ),
+            )
+        )
+
     def progress_display(self, obj):
         if obj.total_rows == 0:
             return "No data"
 
-        processed = (
-            obj.items_created + obj.items_updated + obj.items_skipped + obj.items_failed
-        )
-        percentage = (processed / obj.total_rows * 100) if obj.total_rows > 0 else 0
-
         return format_html(
             '<div style="width: 100px; background: #e5e7eb; border-radius: 3px; overflow: hidden;">'
             '<div style="width: {}%; background: #10b981; height: 20px; line-height: 20px; '
-            'text-align: center; color: white; font-size: 11px; font-weight: bold;">{:.0f}%</div></div>'
+            'text-align: center; color: white; font-size: 11px; font-weight: bold;">{}%</div></div>'
             '<div style="font-size: 11px; color: #6b7280; margin-top: 2px;">'
             "{} / {} items</div>",
-            percentage,
-            percentage,
-            processed,
+            obj.progress_pct,
+            obj.progress_pct,
+            obj.processed_items,
             obj.total_rows,
         )
 
     progress_display.short_description = "Progress"
 
     def duration_display(self, obj):
-        duration = obj.duration
+        duration = obj.processing_time
         if duration:
             total_seconds = int(duration.total_seconds())
             minutes, seconds = divmod(total_seconds, 60)
@@ -169,6 +235,7 @@ class FacultyEntryAdmin(admin.ModelAdmin):
         "processed_badge",
         "row_number",
     ]
+    list_select_related = ["batch"]
     list_filter = [
         "processed",
         "batch__faculty_code",
@@ -225,23 +292,12 @@ class FacultyEntryAdmin(admin.ModelAdmin):
     )
 
     def batch_link(self, obj):
-        url = reverse("admin:ingest_ingestionbatch_change", args=[obj.batch.id])
-        return format_html('<a href="{}">{}</a>', url, obj.batch)
+        return _batch_link_html(obj)
 
     batch_link.short_description = "Batch"
 
     def processed_badge(self, obj):
-        if obj.processed:
-            return format_html(
-                '<span style="background: #10b981; color: white; padding: 2px 6px; '
-                'border-radius: 3px; font-size: 11px;">{}</span>',
-                "✓",
-            )
-        return format_html(
-            '<span style="background: #6b7280; color: white; padding: 2px 6px; '
-            'border-radius: 3px; font-size: 11px;">{}</span>',
-            "○",
-        )
+        return PROCESSED_BADGE if obj.processed else UNPROCESSED_BADGE
 
     processed_badge.short_description = "Done"
 
@@ -259,6 +315,7 @@ class QlikEntryAdmin(admin.ModelAdmin):
         "processed_badge",
         "row_number",
     ]
+    list_select_related = ["batch"]
     list_filter = [
         "processed",
         "status",
@@ -360,8 +417,7 @@ class QlikEntryAdmin(admin.ModelAdmin):
     )
 
     def batch_link(self, obj):
-        url = reverse("admin:ingest_ingestionbatch_change", args=[obj.batch.id])
-        return format_html('<a href="{}">{}</a>', url, obj.batch)
+        return _batch_link_html(obj)
 
     batch_link.short_description = "Batch"
 
@@ -373,17 +429,7 @@ class QlikEntryAdmin(admin.ModelAdmin):
     filename_short.short_description = "Filename"
 
     def processed_badge(self, obj):
-        if obj.processed:
-            return format_html(
-                '<span style="background: #10b981; color: white; padding: 2px 6px; '
-                'border-radius: 3px; font-size: 11px;">{}</span>',
-                "✓",
-            )
-        return format_html(
-            '<span style="background: #6b7280; color: white; padding: 2px 6px; '
-            'border-radius: 3px; font-size: 11px;">{}</span>',
-            "○",
-        )
+        return PROCESSED_BADGE if obj.processed else UNPROCESSED_BADGE
 
     processed_badge.short_description = "Done"
 
@@ -400,6 +446,7 @@ class ProcessingFailureAdmin(admin.ModelAdmin):
         "error_type",
         "created_at",
     ]
+    list_select_related = ["batch"]
     list_filter = [
         "error_type",
         "created_at",
@@ -449,15 +496,19 @@ class ProcessingFailureAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The raw row is only shown on the change form; keep it off the list
+        if request.resolver_match.url_name == "ingest_processingfailure_changelist":
+            queryset = queryset.defer("row_data")
+        return queryset
+
     def batch_link(self, obj):
-        url = reverse("admin:ingest_ingestionbatch_change", args=[obj.batch.id])
-        return format_html('<a href="{}">{}</a>', url, obj.batch)
+        return _batch_link_html(obj)
 
     batch_link.short_description = "Batch"
 
     def row_data_display(self, obj):
-        import json
-
         data_json = json.dumps(obj.row_data, indent=2)
         return format_html(
             '<pre style="background: #f3f4f6; padding: 10px; border-radius: 4px;">{}</pre>',
@@ -7,7 +7,10 @@ import traceback
 from asgiref.sync import async_to_sync
 from django.core.management.base import BaseCommand
 
-from apps.documents.services.download import download_undownloaded_pdfs
+from apps.documents.services.download import (
+    DOWNLOAD_CONCURRENCY,
+    download_undownloaded_pdfs,
+)
 
 
 class Command(BaseCommand):
@@ -20,6 +23,12 @@ class Command(BaseCommand):
             default=0,
             help="Maximum number of PDFs to download (default: 0 = no limit)",
         )
+        parser.add_argument(
+            "--max-concurrent",
+            type=int,
+            default=DOWNLOAD_CONCURRENCY,
+            help=f"Maximum concurrent downloads (default: {DOWNLOAD_CONCURRENCY})",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("Starting PDF download...")
@@ -27,6 +36,7 @@ class Command(BaseCommand):
         try:
             result = async_to_sync(download_undownloaded_pdfs)(
                 limit=options["limit"],
+                max_concurrent=options["max_concurrent"],
             )
 
             if result is None:
@@ -1,14 +1,36 @@
+import asyncio
+import os
 from pathlib import Path
 
+from asgiref.sync import async_to_sync, sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files import File
 from django.core.management.base import BaseCommand
+from django.db import connections
+from xxhash import xxh3_64
 
 from apps.ingest.models import IngestionBatch
 from apps.ingest.tasks import process_batch, stage_batch
 
 
+def _file_hash(path: Path) -> str:
+    """Return the xxh3 hex digest of a file, read in 1 MiB chunks."""
+    digest = xxh3_64()
+    with Path.open(path, "rb") as fh:
+        while chunk := fh.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stage_in_thread(batch_id):
+    """Stage one batch from a worker thread and close that thread's connections."""
+    try:
+        return stage_batch.call(batch_id)
+    finally:
+        connections.close_all()
+
+
 class Command(BaseCommand):
     help = "Ingest Faculty Sheets (workflow workbooks) via the Phase A ingestion pipeline (IngestionBatch)."
 
@@ -33,6 +55,17 @@ class Command(BaseCommand):
             default=True,
             help="Deprecated (kept for compatibility). No-op in Phase A pipeline.",
         )
+        parser.add_argument(
+            "--max-concurrent",
+            type=int,
+            default=8,
+            help="Maximum workbooks staged at the same time (default: 8)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Also ingest workbooks whose contents were ingested before.",
+        )
 
     def handle(self, *args, **options):
         dir_path = options["dir"]
@@ -61,38 +94,76 @@ class Command(BaseCommand):
             user.save(update_fields=["password"])
 
         # Expect a tree like: <root>/<FACULTY>/(inbox|in_progress|done).xlsx
+        # scandir reports entry types from the directory listing itself, so
+        # this costs one listing per folder rather than a stat per path.
         workbooks = []
-        for faculty_dir in sorted([p for p in target_dir.iterdir() if p.is_dir()]):
-            faculty_code = faculty_dir.name
+        with os.scandir(target_dir) as entries:
+            faculty_codes = sorted(entry.name for entry in entries if entry.is_dir())
+        for faculty_code in faculty_codes:
+            faculty_dir = target_dir / faculty_code
+            with os.scandir(faculty_dir) as entries:
+                file_names = {entry.name for entry in entries if entry.is_file()}
             for bucket in ["inbox", "in_progress", "done"]:
-                path = faculty_dir / f"{bucket}.xlsx"
-                if path.exists():
-                    workbooks.append((faculty_code, bucket, path))
+                if f"{bucket}.xlsx" in file_names:
+                    workbooks.append(
+                        (faculty_code, bucket, faculty_dir / f"{bucket}.xlsx")
+                    )
 
         if not workbooks:
             self.stdout.write("No faculty workbook files found.")
             return
 
-        ok = 0
-        failed = 0
+        # A workbook whose exact contents already went through a completed
+        # batch for its faculty has nothing new to ingest.
+        pending = []
         for faculty_code, bucket, path in workbooks:
-            self.stdout.write(f"- Processing {faculty_code}/{path.name}...")
-            batch = IngestionBatch.objects.create(
-                source_type=IngestionBatch.SourceType.FACULTY,
-                uploaded_by=user,
-                faculty_code=faculty_code,
-            )
-
+            source_hash = _file_hash(path)
+            if (
+                not options["force"]
+                and IngestionBatch.objects.filter(
+                    source_type=IngestionBatch.SourceType.FACULTY,
+                    faculty_code=faculty_code,
+                    source_hash=source_hash,
+                    status=IngestionBatch.Status.COMPLETED,
+                ).exists()
+            ):
+                self.stdout.write(f"- Skipping unchanged {faculty_code}/{path.name}")
+                continue
+            pending.append((faculty_code, bucket, path, source_hash))
+
+        batches = []
+        for faculty_code, bucket, path, source_hash in pending:
+            # The workbook is streamed into storage while the batch is inserted
             with Path.open(path, "rb") as fh:
-                batch.source_file = File(fh, name=f"{faculty_code}_{bucket}.xlsx")
-                batch.save()
+                batch = IngestionBatch.objects.create(
+                    source_type=IngestionBatch.SourceType.FACULTY,
+                    uploaded_by=user,
+                    faculty_code=faculty_code,
+                    source_file=File(fh, name=f"{faculty_code}_{bucket}.xlsx"),
+                    source_hash=source_hash,
+                )
+            batches.append(batch)
+
+        # Staging only reads a workbook into its own batch's staging rows, so
+        # workbooks are staged side by side. Processing merges into shared
+        # CopyrightItems and stays serial, in workbook order.
+        stage_results = async_to_sync(self._stage_all)(
+            [batch.id for batch in batches], options["max_concurrent"]
+        )
 
+        ok = 0
+        failed = 0
+        for (faculty_code, _bucket, path, _hash), batch, stage_result in zip(
+            pending, batches, stage_results, strict=True
+        ):
+            self.stdout.write(f"- Processing {faculty_code}/{path.name}...")
             try:
-                stage_result = stage_batch(batch.id)
+                if isinstance(stage_result, Exception):
+                    raise stage_result
                 if not stage_result.get("success"):
                     raise RuntimeError(f"Staging failed: {stage_result}")
 
-                process_result = process_batch(batch.id)
+                process_result = process_batch.call(batch.id)
                 if not process_result.get("success"):
                     raise RuntimeError(f"Processing failed: {process_result}")
 
@@ -106,3 +177,16 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(f"Faculty ingestion complete. OK={ok}, Failed={failed}")
         )
+
+    async def _stage_all(self, batch_ids, max_concurrent):
+        """Stage the batches concurrently; failures are returned, not raised."""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        stage = sync_to_async(_stage_in_thread, thread_sensitive=False)
+
+        async def stage_one(batch_id):
+            async with semaphore:
+                return await stage(batch_id)
+
+        return await asyncio.gather(
+            *(stage_one(batch_id) for batch_id in batch_ids), return_exceptions=True
+        )
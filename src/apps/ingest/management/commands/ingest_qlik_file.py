@@ -37,6 +37,7 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Ingesting file: {file_path}")
 
+        # Storage copies the open file in chunks while the batch is inserted
         with open(file_path, "rb") as f:
             django_file = DjangoFile(f, name=os.path.basename(file_path))
 
@@ -49,7 +50,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"Created IngestionBatch #{batch.id}"))
 
         self.stdout.write("Staging batch...")
-        stage_result = stage_batch(batch.id)
+        stage_result = stage_batch.call(batch.id)
+        batch.refresh_from_db()
         if not stage_result["success"]:
             self.stderr.write(
                 self.style.ERROR(f"Staging failed: {batch.error_message}")
@@ -61,7 +63,8 @@ class Command(BaseCommand):
         )
 
         self.stdout.write("Processing batch...")
-        process_result = process_batch(batch.id)
+        process_result = process_batch.call(batch.id)
+        batch.refresh_from_db()
         if not process_result["success"]:
             self.stderr.write(
                 self.style.ERROR(f"Processing failed: {batch.error_message}")
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.conf import settings
@@ -49,14 +50,23 @@ class Command(BaseCommand):
                 self.stderr.write(f"Legacy directory not found: {legacy_dir}")
                 return
 
-            # Find newest xlsx
-            files = list(legacy_dir.glob("*.xlsx"))
-            if not files:
+            # Find newest xlsx by creation time; scandir entries cache their
+            # stat, so each file is stat'ed once while scanning.
+            with os.scandir(legacy_dir) as entries:
+                newest = max(
+                    (
+                        entry
+                        for entry in entries
+                        if entry.name.endswith(".xlsx") and entry.is_file()
+                    ),
+                    key=lambda entry: entry.stat().st_ctime,
+                    default=None,
+                )
+            if newest is None:
                 self.stderr.write("No .xlsx files found in legacy directory.")
                 return
 
-            # Use creation time to find newest
-            target_file = max(files, key=lambda f: f.stat().st_ctime)
+            target_file = Path(newest.path)
             self.stdout.write(f"Found newest file in legacy path: {target_file}")
 
         else:
@@ -75,20 +85,19 @@ class Command(BaseCommand):
             user.set_unusable_password()
             user.save(update_fields=["password"])
 
-        batch = IngestionBatch.objects.create(
-            source_type=IngestionBatch.SourceType.QLIK,
-            uploaded_by=user,
-        )
-
+        # The workbook is streamed into storage while the batch is inserted
         with Path.open(target_file, "rb") as fh:
-            batch.source_file = File(fh, name=Path(target_file).name)
-            batch.save()
+            batch = IngestionBatch.objects.create(
+                source_type=IngestionBatch.SourceType.QLIK,
+                uploaded_by=user,
+                source_file=File(fh, name=Path(target_file).name),
+            )
 
-        stage_result = stage_batch(batch.id)
+        stage_result = stage_batch.call(batch.id)
         if not stage_result.get("success"):
             raise RuntimeError(f"Staging failed: {stage_result}")
 
-        process_result = process_batch(batch.id)
+        process_result = process_batch.call(batch.id)
         if not process_result.get("success"):
             raise RuntimeError(f"Processing failed: {process_result}")
 
@@ -38,7 +38,7 @@ class Command(BaseCommand):
 
         # Validate batch exists
         try:
-            batch = IngestionBatch.objects.get(id=batch_id)
+            batch = IngestionBatch.objects.only("source_type").get(id=batch_id)
         except IngestionBatch.DoesNotExist:
             raise CommandError(f"IngestionBatch with ID {batch_id} does not exist")
 
@@ -52,7 +52,7 @@ class Command(BaseCommand):
         if not process_only:
             self.stdout.write("Running staging phase...")
             try:
-                result = stage_batch(batch_id)
+                result = stage_batch.call(batch_id)
                 if result["success"]:
                     self.stdout.write(
                         self.style.SUCCESS(
@@ -77,7 +77,7 @@ class Command(BaseCommand):
         # Run processing
         self.stdout.write("Running processing phase...")
         try:
-            result = process_batch(batch_id)
+            result = process_batch.call(batch_id)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"✓ Processing complete:\n"
@@ -26,7 +26,7 @@ class Command(BaseCommand):
         batch_id = options.get("batch_id")
 
         if batch_id:
-            result = process_batch(batch_id)
+            result = process_batch.call(batch_id)
             self.stdout.write(
                 self.style.SUCCESS(f"Processed batch {batch_id}: {result}")
             )
@@ -35,21 +35,23 @@ class Command(BaseCommand):
         qs = IngestionBatch.objects.filter(
             status=IngestionBatch.Status.STAGED
         ).order_by("uploaded_at")
-        batches = list(qs[:limit])
-        if not batches:
+        batch_ids = list(qs.values_list("id", flat=True)[:limit])
+        if not batch_ids:
             self.stdout.write("No STAGED batches found.")
             return
 
+        # Batches merge into shared CopyrightItems, so later uploads must be
+        # applied after earlier ones: process one at a time, oldest first.
         ok = 0
         failed = 0
-        for b in batches:
+        for b_id in batch_ids:
             try:
-                result = process_batch(b.id)
+                result = process_batch.call(b_id)
                 if not result.get("success"):
                     raise RuntimeError(result)
                 ok += 1
             except Exception as e:
                 failed += 1
-                self.stderr.write(self.style.ERROR(f"Failed batch {b.id}: {e}"))
+                self.stderr.write(self.style.ERROR(f"Failed batch {b_id}: {e}"))
 
         self.stdout.write(self.style.SUCCESS(f"Done. OK={ok}, Failed={failed}"))
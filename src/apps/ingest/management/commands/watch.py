@@ -1,5 +1,26 @@
+import os
+import time
+
 from django.core.management.base import BaseCommand
-from watchfiles import watch
+from watchfiles import Change, watch
+
+
+def _wait_for_complete_copy(path: str, interval: float) -> os.stat_result | None:
+    """
+    Wait until a file stops growing and return its final stat.
+
+    Returns None if the file disappeared in the meantime.
+    """
+    try:
+        stat = os.stat(path)
+        while True:
+            time.sleep(interval)
+            new_stat = os.stat(path)
+            if new_stat.st_size == stat.st_size:
+                return new_stat
+            stat = new_stat
+    except FileNotFoundError:
+        return None
 
 
 class Command(BaseCommand):
@@ -12,25 +33,48 @@ class Command(BaseCommand):
             default="/raw_data",
             help="Path to watch for new Excel files (default: /raw_data)",
         )
+        parser.add_argument(
+            "--settle",
+            type=float,
+            default=2.0,
+            help="Seconds a file's size must stay unchanged before it is ingested "
+            "(default: 2.0)",
+        )
 
     def handle(self, *args, **options):
         watch_path = options["path"]
+        settle = options["settle"]
         self.stdout.write(f"Watching {watch_path} for .xlsx files...")
 
+        # Copying a large workbook fires several events for the same path,
+        # possibly spread over multiple change sets. Each path is ingested once
+        # per distinct (size, mtime) it settles on.
+        ingested: dict[str, tuple[int, float]] = {}
+
         for changes in watch(watch_path):
-            for _change, path in changes:
-                if path.endswith(".xlsx"):
-                    self.stdout.write(f"New file detected: {path}")
-
-                    # Use the ingest_qlik_file management command to process the file
-                    from apps.ingest.management.commands.ingest_qlik_file import (
-                        Command as IngestCommand,
-                    )
-
-                    ingest_cmd = IngestCommand()
-                    try:
-                        ingest_cmd.handle(file_path=path)
-                    except Exception as e:
-                        self.stderr.write(
-                            self.style.ERROR(f"Failed to ingest {path}: {e}")
-                        )
+            paths = {
+                path
+                for change, path in changes
+                if change != Change.deleted and path.endswith(".xlsx")
+            }
+            for path in sorted(paths):
+                stat = _wait_for_complete_copy(path, settle)
+                if stat is None:
+                    continue
+                signature = (stat.st_size, stat.st_mtime)
+                if ingested.get(path) == signature:
+                    continue
+                ingested[path] = signature
+
+                self.stdout.write(f"New file detected: {path}")
+
+                # Use the ingest_qlik_file management command to process the file
+                from apps.ingest.management.commands.ingest_qlik_file import (
+                    Command as IngestCommand,
+                )
+
+                ingest_cmd = IngestCommand()
+                try:
+                    ingest_cmd.handle(file_path=path)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f"Failed to ingest {path}: {e}"))
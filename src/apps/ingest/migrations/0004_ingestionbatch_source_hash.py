@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ingest", "0003_add_export_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestionbatch",
+            name="source_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="xxh3 hash of the source file, used to skip unchanged files",
+                max_length=32,
+            ),
+        ),
+    ]
@@ -142,6 +142,13 @@ class IngestionBatch(models.Model):
     source_file = models.FileField(
         upload_to="ingestion_batches/%Y/%m/%d/", help_text="Original uploaded file"
     )
+    source_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="xxh3 hash of the source file, used to skip unchanged files",
+    )
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
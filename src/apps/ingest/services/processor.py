@@ -23,6 +23,13 @@ from apps.ingest.services.merge_rules import (
 from apps.ingest.services.standardizer import safe_datetime
 from config.university import DEPARTMENT_MAPPING_LOWER, FACULTY_NAME_BY_ABBR
 
+# Statuses of a batch that a processing run has already finished
+FINISHED_STATUSES = (
+    IngestionBatch.Status.COMPLETED,
+    IngestionBatch.Status.PARTIAL,
+    IngestionBatch.Status.FAILED,
+)
+
 
 class BatchProcessor:
     """
@@ -44,45 +51,69 @@ class BatchProcessor:
         """
         Main processing entry point.
 
-        Dispatches to appropriate handler based on source type.
+        Dispatches to appropriate handler based on source type. A batch that
+        another run already finished is left as it is.
         """
         try:
-            self.batch.status = IngestionBatch.Status.PROCESSING
-            self.batch.started_at = timezone.now()
-            self.batch.save(update_fields=["status", "started_at"])
-
-            if self.batch.source_type == IngestionBatch.SourceType.QLIK:
-                self._process_qlik_batch()
-            elif self.batch.source_type == IngestionBatch.SourceType.FACULTY:
-                self._process_faculty_batch()
-            else:
-                raise ValueError(f"Unknown source type: {self.batch.source_type}")
-
-            # Update final statistics
-            self.batch.items_created = self.stats["created"]
-            self.batch.items_updated = self.stats["updated"]
-            self.batch.items_skipped = self.stats["skipped"]
-            self.batch.items_failed = self.stats["failed"]
-            self.batch.completed_at = timezone.now()
-
-            # Determine final status
-            if self.stats["failed"] == 0:
-                self.batch.status = IngestionBatch.Status.COMPLETED
-            elif self.stats["failed"] < self.batch.rows_staged:
-                self.batch.status = IngestionBatch.Status.PARTIAL
-            else:
-                self.batch.status = IngestionBatch.Status.FAILED
-
-            self.batch.save(
-                update_fields=[
-                    "items_created",
-                    "items_updated",
-                    "items_skipped",
-                    "items_failed",
-                    "completed_at",
-                    "status",
-                ]
+            started_at = timezone.now()
+            # Waits while another run holds the batch lock, and does not reopen
+            # a batch that run finished
+            started = (
+                IngestionBatch.objects.filter(pk=self.batch.pk)
+                .exclude(status__in=FINISHED_STATUSES)
+                .update(status=IngestionBatch.Status.PROCESSING, started_at=started_at)
             )
+            if not started:
+                self._skip_finished_batch()
+                return
+            self.batch.status = IngestionBatch.Status.PROCESSING
+            self.batch.started_at = started_at
+
+            # One commit for the whole batch and its statistics, with a
+            # savepoint per entry. A concurrent run on the same batch waits for
+            # the batch row lock and then finds the batch finished.
+            with transaction.atomic():
+                locked = (
+                    IngestionBatch.objects.select_for_update()
+                    .only("status")
+                    .get(pk=self.batch.pk)
+                )
+                if locked.status in FINISHED_STATUSES:
+                    self._skip_finished_batch()
+                    return
+
+                if self.batch.source_type == IngestionBatch.SourceType.QLIK:
+                    self._process_qlik_batch()
+                elif self.batch.source_type == IngestionBatch.SourceType.FACULTY:
+                    self._process_faculty_batch()
+                else:
+                    raise ValueError(f"Unknown source type: {self.batch.source_type}")
+
+                # Update final statistics
+                self.batch.items_created = self.stats["created"]
+                self.batch.items_updated = self.stats["updated"]
+                self.batch.items_skipped = self.stats["skipped"]
+                self.batch.items_failed = self.stats["failed"]
+                self.batch.completed_at = timezone.now()
+
+                # Determine final status
+                if self.stats["failed"] == 0:
+                    self.batch.status = IngestionBatch.Status.COMPLETED
+                elif self.stats["failed"] < self.batch.rows_staged:
+                    self.batch.status = IngestionBatch.Status.PARTIAL
+                else:
+                    self.batch.status = IngestionBatch.Status.FAILED
+
+                self.batch.save(
+                    update_fields=[
+                        "items_created",
+                        "items_updated",
+                        "items_skipped",
+                        "items_failed",
+                        "completed_at",
+                        "status",
+                    ]
+                )
 
             logger.info(
                 f"Batch from file {self.batch.source_file} complete: "
@@ -102,17 +133,27 @@ class BatchProcessor:
             self.batch.save(update_fields=["status", "error_message", "completed_at"])
             raise
 
+    def _skip_finished_batch(self):
+        """Load the statistics of a batch that another run already finished."""
+        self.batch.refresh_from_db()
+        logger.info(
+            f"Batch from file {self.batch.source_file} was already processed "
+            f"({self.batch.status}), skipping"
+        )
+
     def _process_qlik_batch(self):
         """Process Qlik entries (can create + update).
 
-        Each entry is processed in its own transaction - if one fails,
-        it rolls back independently without affecting other entries.
+        Each entry is processed in its own savepoint inside the batch
+        transaction - if one fails, it rolls back independently without
+        affecting other entries. A failure outside the savepoints rolls back
+        the whole batch.
         """
         entries = self.batch.qlik_entries.filter(processed=False).order_by("row_number")
 
         for entry in entries:
             try:
-                # Each item is processed in its own transaction
+                # Each item is processed in its own savepoint
                 with transaction.atomic(savepoint=True):
                     self._process_qlik_entry(entry)
                     entry.processed = True
@@ -135,8 +176,10 @@ class BatchProcessor:
     def _process_faculty_batch(self):
         """Process Faculty entries (update-only).
 
-        Each entry is processed in its own transaction - if one fails,
-        it rolls back independently without affecting other entries.
+        Each entry is processed in its own savepoint inside the batch
+        transaction - if one fails, it rolls back independently without
+        affecting other entries. A failure outside the savepoints rolls back
+        the whole batch.
         """
         entries = self.batch.faculty_entries.filter(processed=False).order_by(
             "row_number"
@@ -144,7 +187,7 @@ class BatchProcessor:
 
         for entry in entries:
             try:
-                # Each item is processed in its own transaction
+                # Each item is processed in its own savepoint
                 with transaction.atomic(savepoint=True):
                     self._process_faculty_entry(entry)
                     entry.processed = True
@@ -4,6 +4,8 @@ Async tasks for ingestion pipeline.
 Tasks can be triggered by Django views or management commands.
 """
 
+import itertools
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import polars as pl
@@ -21,6 +23,9 @@ from .services import (
     validate_qlik_data,
 )
 
+# Staging entries built and inserted per bulk_create
+STAGING_BATCH_SIZE = 1000
+
 
 @task
 def stage_batch(batch_id: int, auto_process: bool = False) -> dict[str, Any]:
@@ -138,8 +143,8 @@ def process_batch(batch_id: int) -> dict[str, Any]:
         Dictionary with processing results
     """
     try:
-        # Get batch
-        batch = IngestionBatch.objects.get(id=batch_id)
+        # Get batch, with the uploader that every ChangeLog entry references
+        batch = IngestionBatch.objects.select_related("uploaded_by").get(id=batch_id)
 
         logger.info(f"Processing batch {batch_id} ({batch.source_type})")
 
@@ -156,9 +161,11 @@ def process_batch(batch_id: int) -> dict[str, Any]:
         )
 
         # Trigger Phase B Enrichment
+        from asgiref.sync import async_to_sync
+
         from apps.enrichment.tasks import trigger_batch_enrichment
 
-        trigger_batch_enrichment(batch_id)
+        async_to_sync(trigger_batch_enrichment)(batch_id)
 
         return {
             "success": True,
@@ -176,12 +183,17 @@ def process_batch(batch_id: int) -> dict[str, Any]:
 
 def _stage_qlik_entries(batch: IngestionBatch, df: pl.DataFrame) -> int:
     """Create QlikEntry records from DataFrame."""
-    entries = []
+    return _bulk_create_in_batches(QlikEntry, _iter_qlik_entries(batch, df))
 
+
+def _iter_qlik_entries(batch: IngestionBatch, df: pl.DataFrame) -> Iterator[QlikEntry]:
+    """Yield unsaved QlikEntry records, one per DataFrame row."""
+    # Cast ids in polars once instead of calling int() on every row
+    df = df.with_columns(pl.col("material_id").cast(pl.Int64))
     for row in df.iter_rows(named=True):
-        entry = QlikEntry(
+        yield QlikEntry(
             batch=batch,
-            material_id=int(row["material_id"]),
+            material_id=row["material_id"],
             row_number=row["row_number"],
             # File metadata
             filename=row.get("filename"),
@@ -218,37 +230,52 @@ def _stage_qlik_entries(batch: IngestionBatch, df: pl.DataFrame) -> int:
             infringement=row.get("infringement"),
             possible_fine=safe_float(row.get("possible_fine")),
         )
-        entries.append(entry)
 
-    # Bulk create
-    QlikEntry.objects.bulk_create(entries, batch_size=1000)
 
-    return len(entries)
+# Human-managed fields copied from a faculty workbook into FacultyEntry
+FACULTY_ENTRY_FIELDS = (
+    "workflow_status",
+    "classification",
+    "manual_classification",
+    "v2_manual_classification",
+    "v2_overnamestatus",
+    "v2_lengte",
+    "remarks",
+    "scope",
+    "manual_identifier",
+)
 
 
 def _stage_faculty_entries(batch: IngestionBatch, df: pl.DataFrame) -> int:
     """Create FacultyEntry records from DataFrame."""
-    entries = []
-
-    for row in df.iter_rows(named=True):
-        entry = FacultyEntry(
-            batch=batch,
-            material_id=int(row["material_id"]),
-            row_number=row["row_number"],
-            # Human-managed fields
-            workflow_status=row.get("workflow_status"),
-            classification=row.get("classification"),
-            manual_classification=row.get("manual_classification"),
-            v2_manual_classification=row.get("v2_manual_classification"),
-            v2_overnamestatus=row.get("v2_overnamestatus"),
-            v2_lengte=row.get("v2_lengte"),
-            remarks=row.get("remarks"),
-            scope=row.get("scope"),
-            manual_identifier=row.get("manual_identifier"),
-        )
-        entries.append(entry)
-
-    # Bulk create
-    FacultyEntry.objects.bulk_create(entries, batch_size=1000)
+    # Cast ids and pick the staged columns in polars, so rows are only
+    # materialised for the fields FacultyEntry stores.
+    rows = df.select(
+        pl.col("material_id").cast(pl.Int64),
+        "row_number",
+        *(
+            field if field in df.columns else pl.lit(None).alias(field)
+            for field in FACULTY_ENTRY_FIELDS
+        ),
+    ).iter_rows(named=True)
+    return _bulk_create_in_batches(
+        FacultyEntry, (FacultyEntry(batch=batch, **row) for row in rows)
+    )
+
+
+def _bulk_create_in_batches(
+    model: type[QlikEntry | FacultyEntry],
+    entries: Iterable[QlikEntry | FacultyEntry],
+    batch_size: int = STAGING_BATCH_SIZE,
+) -> int:
+    """
+    Insert staging entries one batch at a time and return how many were created.
 
-    return len(entries)
+    Entries are consumed lazily, so only one batch of model instances is held
+    in memory regardless of the size of the sheet.
+    """
+    created = 0
+    for chunk in itertools.batched(entries, batch_size, strict=False):
+        model.objects.bulk_create(chunk, batch_size=batch_size)
+        created += len(chunk)
+    return created
@@ -319,3 +319,25 @@ def test_empty_export_does_not_fail(test_user, tmp_path):
     # Should complete without error
     assert "error" not in result or result.get("error") is None
     assert export_dir.exists()
+
+
+@pytest.mark.django_db
+def test_finished_batch_keeps_its_results():
+    """Processing a batch that another run finished leaves its stats alone."""
+    user = User.objects.create_user(username="rerun", email="rerun@example.com")
+    batch = IngestionBatch.objects.create(
+        source_type=IngestionBatch.SourceType.QLIK,
+        source_file="qlik_data.xlsx",
+        uploaded_by=user,
+        status=IngestionBatch.Status.PARTIAL,
+        rows_staged=3,
+        items_created=2,
+        items_failed=1,
+    )
+
+    BatchProcessor(IngestionBatch.objects.get(pk=batch.pk)).process()
+
+    batch.refresh_from_db()
+    assert batch.status == IngestionBatch.Status.PARTIAL
+    assert batch.items_created == 2
+    assert batch.items_failed == 1
@@ -162,18 +162,23 @@ def read_faculty_sheets(
                 and "llm" not in file.name.lower()
             ):
                 try:
-                    df = _read_excel_quiet(file, sheet_name=data_entry_name)
-
-                    # Ensure columns exist/cast type
-                    for col_name in select_cols:
-                        if col_name not in df.columns:
-                            df = df.with_columns(
-                                pl.lit(None).alias(col_name).cast(pl.String)
-                            )
-                        else:
-                            df = df.with_columns(pl.col(col_name).cast(pl.String))
-
-                    df = df.select(select_cols)
+                    # Only the selected columns are parsed, directly as strings
+                    df = _read_excel_quiet(
+                        file,
+                        sheet_name=data_entry_name,
+                        read_options={
+                            "use_columns": lambda col: col.name in select_cols,
+                            "dtypes": "string",
+                        },
+                    )
+
+                    # Ensure columns exist
+                    df = df.select(
+                        pl.col(col_name)
+                        if col_name in df.columns
+                        else pl.lit(None, dtype=pl.String).alias(col_name)
+                        for col_name in select_cols
+                    )
                     all_dfs.append(df)
                 except Exception as e:
                     logger.warning(f"Error reading {file}: {e}")
@@ -15,7 +15,8 @@ from loguru import logger
 logger.remove()
 
 # Determine log level from environment
-LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if os.getenv("DEBUG") else "INFO")
+DEBUG = bool(os.getenv("DEBUG"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
 
 # Console handler with colors
 logger.add(
@@ -28,12 +29,16 @@ logger.add(
     ),
     level=LOG_LEVEL,
     colorize=True,
-    backtrace=True,
-    diagnose=True,
+    # Outside DEBUG, records are formatted and written by a background thread
+    # so bursts of tracebacks (e.g. a failing enrichment batch) do not stall
+    # the event loop; variable-annotated tracebacks are a DEBUG-only aid.
+    enqueue=not DEBUG,
+    backtrace=DEBUG,
+    diagnose=DEBUG,
 )
 
 # File handler for production (only in non-DEBUG mode)
-if not os.getenv("DEBUG"):
+if not DEBUG:
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
 
@@ -195,6 +195,10 @@ REDIS_CACHE_STATS = env.bool("REDIS_CACHE_STATS", default=True)
 DATABASES = {"default": env.db_url_config(_db_url)}
 DATABASES["default"]["TEST"] = {
     "NAME": "test_copyright_db_isolated",
+    # Optional pre-migrated database to clone test databases from. With
+    # `pytest -n auto` every xdist worker gets its own database; cloning a
+    # template is much faster than migrating each one from scratch.
+    "TEMPLATE": env("TEST_DATABASE_TEMPLATE", default=None),
 }
 
 # =============================================================================
@@ -287,6 +291,10 @@ TASKS = {
     },
 }
 
+# ENRICHMENT_CONCURRENCY: Items enriched concurrently inside one batch task.
+# Enrichment is HTTP/DB-bound, so this can be well above the CPU count.
+ENRICHMENT_CONCURRENCY = env.int("ENRICHMENT_CONCURRENCY", default=16)
+
 # RQ_QUEUES for django-rq
 RQ_QUEUES = {
     "default": {
@@ -326,6 +334,10 @@ CANVAS_API_TOKEN = env("CANVAS_API_TOKEN", default="") or env(
 # Osiris Scraper Settings (University of Twente course/teacher data)
 # OSIRIS_BASE_URL: The Osiris student portal URL
 OSIRIS_BASE_URL = env("OSIRIS_BASE_URL", default="https://utwente.osiris-student.nl")
+# OSIRIS_PERSON_CONCURRENCY: Max concurrent people-page lookups per course
+OSIRIS_PERSON_CONCURRENCY = env.int("OSIRIS_PERSON_CONCURRENCY", default=8)
+# OSIRIS_CACHE_TIMEOUT: Seconds course and people-page lookups stay cached
+OSIRIS_CACHE_TIMEOUT = env.int("OSIRIS_CACHE_TIMEOUT", default=86400)
 # OSIRIS_HEADERS: HTTP headers required by the Osiris API
 # These are technical headers for API communication and typically don't need changes
 OSIRIS_HEADERS = {
@@ -347,6 +359,7 @@ OSIRIS_HEADERS = {
     "sec-fetch-mode": "cors",
     "sec-fetch-dest": "empty",
     "referer": "https//utwente.osiris-student.nl/onderwijscatalogus/extern/cursussen",
+    # br/zstd responses are decoded via the httpx brotli/zstd extras
     "accept-encoding": "gzip, deflate, br, zstd",
     "accept-language": "en-GB,en-US;q=0.9,en;q=0.8",
 }